@@ -26,9 +26,13 @@ Foundry-only mode skips Fabric (02-05) and creates a search-only agent.
 """
 
 import argparse
-import subprocess
+import asyncio
+import contextlib
+import runpy
 import sys
 import os
+from collections import deque
+from typing import NamedTuple
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -36,22 +40,48 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 # Configuration
 # ============================================================================
 
+class Step(NamedTuple):
+    """A pipeline step: script to run, display name, rough duration, extra args."""
+    script: str
+    name: str
+    time: str
+    args: tuple = ()
+    path: str = ""
+
+
 STEPS = {
-    "01": {"script": "01_generate_sample_data.py", "name": "Generate Sample Data", "time": "~2min"},
-    "02": {"script": "02_create_fabric_items.py", "name": "Create Fabric Items", "time": "~30s"},
-    "03": {"script": "03_load_fabric_data.py", "name": "Load Data into Fabric", "time": "~1min"},
-    "04": {"script": "04_generate_agent_prompt.py", "name": "Generate Agent Prompt", "time": "~5s"},
-    "05": {"script": "05_create_fabric_agent.py", "name": "Create Fabric Data Agent", "time": "~30s"},
-    "06": {"script": "06_upload_to_search.py", "name": "Upload to AI Search", "time": "~1min"},
-    "07": {"script": "07_create_foundry_agent.py", "name": "Create Foundry Agent", "time": "~10s"},
-    "07-search": {"script": "07_create_foundry_agent.py", "name": "Create Foundry Agent (Search Only)", "time": "~10s", "args": ["--foundry-only"]},
-    "08": {"script": "08_test_foundry_agent.py", "name": "Test Foundry Agent", "time": "interactive"},
+    "01": Step("01_generate_sample_data.py", "Generate Sample Data", "~2min"),
+    "02": Step("02_create_fabric_items.py", "Create Fabric Items", "~30s"),
+    "03": Step("03_load_fabric_data.py", "Load Data into Fabric", "~1min"),
+    "04": Step("04_generate_agent_prompt.py", "Generate Agent Prompt", "~5s"),
+    "05": Step("05_create_fabric_agent.py", "Create Fabric Data Agent", "~30s"),
+    "06": Step("06_upload_to_search.py", "Upload to AI Search", "~1min"),
+    "07": Step("07_create_foundry_agent.py", "Create Foundry Agent", "~10s"),
+    "07-search": Step("07_create_foundry_agent.py", "Create Foundry Agent (Search Only)", "~10s", ("--foundry-only",)),
+    "08": Step("08_test_foundry_agent.py", "Test Foundry Agent", "interactive"),
 }
 
+# Resolve each script path once instead of re-joining it for every use
+STEPS = {k: v._replace(path=os.path.join(script_dir, v.script)) for k, v in STEPS.items()}
+
 # Default pipeline order
 DEFAULT_PIPELINE = ["01", "02", "03", "04", "05", "06", "07"]
 FOUNDRY_ONLY_PIPELINE = ["01", "06", "07-search"]
 
+# Prerequisites for each step. Steps whose prerequisites are all done run
+# concurrently; prerequisites not in the current pipeline are treated as met.
+DEPS = {
+    "01": [],
+    "02": ["01"],
+    "03": ["02"],
+    "04": ["03"],
+    "05": ["04"],
+    "06": ["01"],
+    "07": ["05", "06"],
+    "07-search": ["06"],
+    "08": ["07", "07-search"],
+}
+
 # ============================================================================
 # Parse Arguments
 # ============================================================================
@@ -66,6 +96,8 @@ Examples:
   python scripts/00_build_solution.py --only 07      # Run only specific steps
   python scripts/00_build_solution.py --skip-fabric  # Skip Fabric steps
   python scripts/00_build_solution.py --foundry-only # No Fabric required (Search only)
+  python scripts/00_build_solution.py --in-process   # Run steps in one interpreter
+  python scripts/00_build_solution.py --yes          # No confirmation prompt (CI)
 """
 )
 
@@ -92,13 +124,22 @@ parser.add_argument("--skip-search", action="store_true",
 parser.add_argument("--skip-agents", action="store_true",
                     help="Skip agent creation and testing (05, 07, 08)")
 
+parser.add_argument("--yes", "-y", action="store_true",
+                    help="Don't wait for confirmation (implied when stdin is not a terminal)")
 parser.add_argument("--dry-run", action="store_true",
                     help="Show what would be run without executing")
 parser.add_argument("--continue-on-error", action="store_true",
                     help="Continue running steps even if one fails")
+parser.add_argument("--verbose", "-v", action="store_true",
+                    help="Stream step output live instead of only showing it on failure")
+parser.add_argument("--in-process", action="store_true",
+                    help="Run steps sequentially in this interpreter (skips per-step Python startup and SDK imports)")
 
 args = parser.parse_args()
 
+# Never block on input() when nobody can answer it (CI, azd hooks, pipes)
+interactive = not args.yes and sys.stdin.isatty()
+
 # ============================================================================
 # Determine Pipeline
 # ============================================================================
@@ -132,11 +173,11 @@ if args.skip_agents:
 # Validate
 # ============================================================================
 
-# Check all scripts exist
+# Check all scripts exist (one directory scan instead of a stat per step)
+existing_scripts = {e.name for e in os.scandir(script_dir) if e.is_file()}
 for step in pipeline:
-    script_path = os.path.join(script_dir, STEPS[step]["script"])
-    if not os.path.exists(script_path):
-        print(f"WARNING: Script not found: {STEPS[step]['script']}")
+    if STEPS[step].script not in existing_scripts:
+        print(f"WARNING: Script not found: {STEPS[step].script}")
 
 # Load environment from azd + project .env
 from load_env import load_all_env
@@ -149,14 +190,6 @@ if "01" in pipeline:
     args.size = args.size or os.getenv("DATA_SIZE", "small")
     
     if not args.industry or not args.usecase:
-        print("\n" + "="*60)
-        print("Data Generation")
-        print("="*60)
-        print("\nNo INDUSTRY/USECASE found in .env or CLI args.")
-        print("\nSample scenarios you can use:")
-        print("-" * 60)
-        print(f"  {'Industry':<18} {'Use Case':<40}")
-        print("-" * 60)
         samples = [
             ("Telecommunications", "Network operations and service management"),
             ("Retail", "Inventory management with sales analytics"),
@@ -169,10 +202,23 @@ if "01" in pipeline:
             ("Logistics", "Fleet management with delivery tracking"),
             ("Real Estate", "Property listings and lease management"),
         ]
-        for ind, uc in samples:
-            print(f"  {ind:<18} {uc:<40}")
-        print("-" * 60)
-        print()
+        # Build the whole table and write it in one call
+        sys.stdout.write("\n".join([
+            "", "="*60, "Data Generation", "="*60,
+            "", "No INDUSTRY/USECASE found in .env or CLI args.",
+            "", "Sample scenarios you can use:",
+            "-" * 60,
+            f"  {'Industry':<18} {'Use Case':<40}",
+            "-" * 60,
+            *(f"  {ind:<18} {uc:<40}" for ind, uc in samples),
+            "-" * 60,
+            "", "",
+        ]))
+        sys.stdout.flush()
+        if not interactive:
+            print("ERROR: INDUSTRY and USECASE are required in non-interactive mode.")
+            print("       Set them in .env or pass --industry/--usecase")
+            sys.exit(1)
         if not args.industry:
             args.industry = input("Industry: ").strip()
             if not args.industry:
@@ -188,48 +234,42 @@ if "01" in pipeline:
 # Print Plan
 # ============================================================================
 
-print("\n" + "="*60)
-print("Foundry IQ + Fabric IQ Pipeline")
-print("="*60)
-
-print(f"\nSteps ({len(pipeline)}):")
-for i, step in enumerate(pipeline, 1):
-    info = STEPS[step]
-    print(f"  {i}. {info['name']} ({info['time']})")
+plan = ["", "="*60, "Foundry IQ + Fabric IQ Pipeline", "="*60,
+        "", f"Steps ({len(pipeline)}):"]
+plan.extend(f"  {i}. {STEPS[step].name} ({STEPS[step].time})"
+            for i, step in enumerate(pipeline, 1))
 
 if args.industry:
-    print(f"\n  Industry: {args.industry}")
-    print(f"  Use Case: {args.usecase}")
+    plan.extend(["", f"  Industry: {args.industry}", f"  Use Case: {args.usecase}"])
+
+# Write the plan in one call instead of one print per line
+sys.stdout.write("\n".join(plan) + "\n")
+sys.stdout.flush()
 
 if args.dry_run:
     print("\n[DRY RUN] No scripts will be executed.")
     sys.exit(0)
 
-print()
-input("Press Enter to start...")
+if interactive:
+    print()
+    input("Press Enter to start...")
 print()
 
 # ============================================================================
 # Run Pipeline
 # ============================================================================
 
-def run_step(step_id):
-    """Run a single pipeline step."""
+# Remove DATA_FOLDER once so every step inherits an environment that forces
+# it to re-read the fresh value from .env (step 01 rewrites it)
+os.environ.pop("DATA_FOLDER", None)
+
+def build_command(step_id):
+    """Build the command line for a pipeline step."""
     info = STEPS[step_id]
-    script_path = os.path.join(script_dir, info["script"])
-    
-    print(f"> [{step_id}] {info['name']}...", end=" ", flush=True)
-    
-    if not os.path.exists(script_path):
-        print("SKIP (not found)")
-        return True
-    
-    # Build command
-    cmd = [sys.executable, script_path]
+    cmd = [sys.executable, info.path]
     
     # Add step-specific arguments defined in STEPS
-    if "args" in info:
-        cmd.extend(info["args"])
+    cmd.extend(info.args)
     
     # Add arguments for data generation script
     if step_id == "01" and args.industry:
@@ -242,37 +282,179 @@ def run_step(step_id):
     if step_id == "02" and args.clean:
         cmd.append("--clean")
     
-    # Create a clean environment that forces re-reading from .env
-    # Remove DATA_FOLDER so child process reads fresh value from .env
-    clean_env = os.environ.copy()
-    clean_env.pop("DATA_FOLDER", None)
+    return cmd
+
+
+async def run_step(step_id):
+    """Run a single pipeline step."""
+    info = STEPS[step_id]
+    
+    if info.script not in existing_scripts:
+        print(f"> [{step_id}] {info.name}... SKIP (not found)")
+        return True
+    
+    print(f"> [{step_id}] {info.name}...", flush=True)
     
-    # Run with output captured
-    result = subprocess.run(cmd, cwd=os.path.dirname(script_dir), 
-                           capture_output=True, text=True, env=clean_env)
+    proc = await asyncio.create_subprocess_exec(
+        *build_command(step_id), cwd=os.path.dirname(script_dir),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        limit=1024 * 1024)
+    running[step_id] = proc
     
-    if result.returncode != 0:
-        print("[FAIL] FAILED")
-        print(f"\n  Error output:\n{result.stderr[-500:] if result.stderr else result.stdout[-500:]}")
+    # Stream output line by line, keeping only a short tail for error reports
+    tail = deque(maxlen=20)
+    async for raw in proc.stdout:
+        line = raw.decode(errors="replace").rstrip()
+        tail.append(line)
+        if args.verbose:
+            print(f"  [{step_id}] {line}", flush=True)
+    await proc.wait()
+    del running[step_id]
+    
+    if step_id in terminated:
+        print(f"  [{step_id}] STOPPED (another step failed)")
+        return None
+    
+    if proc.returncode != 0:
+        print(f"  [{step_id}] [FAIL] FAILED")
+        print(f"\n  Error output:\n" + "\n".join(tail))
         return False
     
-    print("[OK]")
+    print(f"  [{step_id}] [OK]")
     return True
 
 
-# Track results
-results = {}
-failed = False
+class _TailWriter:
+    """File-like object that keeps the last lines written and optionally echoes them."""
+    
+    def __init__(self, step_id, echo):
+        self.step_id = step_id
+        self.echo = echo
+        self.tail = deque(maxlen=20)
+        self._partial = ""
+    
+    def write(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.tail.append(line)
+            if self.echo:
+                sys.__stdout__.write(f"  [{self.step_id}] {line}\n")
+        return len(text)
+    
+    def flush(self):
+        pass
 
-for step in pipeline:
-    success = run_step(step)
-    results[step] = success
+
+def run_step_in_process(step_id):
+    """Run a single pipeline step inside this interpreter via runpy."""
+    info = STEPS[step_id]
+    cmd = build_command(step_id)
+    
+    if info.script not in existing_scripts:
+        print(f"> [{step_id}] {info.name}... SKIP (not found)")
+        return True
+    
+    print(f"> [{step_id}] {info.name}...", flush=True)
+    
+    # Steps may load DATA_FOLDER into os.environ; drop it so the next one re-reads .env
+    os.environ.pop("DATA_FOLDER", None)
+    
+    writer = _TailWriter(step_id, args.verbose)
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = cmd[1:]
+    os.chdir(os.path.dirname(script_dir))
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+            runpy.run_path(info.path, run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            exit_code = e.code or 0
+        else:
+            # sys.exit("message") prints the message to stderr in a subprocess
+            writer.write(f"{e.code}\n")
+            exit_code = 1
+    except Exception as e:
+        writer.write(f"{type(e).__name__}: {e}\n")
+        exit_code = 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
     
-    if not success:
-        failed = True
-        if not args.continue_on_error:
-            print(f"\nPipeline stopped. Use --continue-on-error to continue despite failures.")
+    if exit_code != 0:
+        print(f"  [{step_id}] [FAIL] FAILED")
+        print(f"\n  Error output:\n" + "\n".join(writer.tail))
+        return False
+    
+    print(f"  [{step_id}] [OK]")
+    return True
+
+
+async def run_pipeline():
+    """Run pipeline steps, starting each as soon as its prerequisites finish."""
+    done = {step: asyncio.Event() for step in pipeline}
+    
+    async def run_one(step):
+        try:
+            for parent in DEPS.get(step, []):
+                if parent in done:
+                    await done[parent].wait()
+            if stop_requested.is_set():
+                results[step] = None
+                return
+            results[step] = await run_step(step)
+            if results[step] is False and not args.continue_on_error:
+                # Fail fast: stop sibling steps instead of letting them finish
+                stop_requested.set()
+                for other, proc in list(running.items()):
+                    # A sibling may have exited before its run_step resumed
+                    if proc.returncode is not None:
+                        continue
+                    terminated.add(other)
+                    try:
+                        proc.terminate()
+                    except ProcessLookupError:
+                        pass
+        finally:
+            done[step].set()
+    
+    stop_requested = asyncio.Event()
+    await asyncio.gather(*[run_one(step) for step in pipeline])
+
+
+# Track results: True = passed, False = failed, None = not run / stopped
+results = {}
+running = {}       # step id -> asyncio subprocess currently executing
+terminated = set()  # steps stopped because a sibling failed
+
+# A single-step run (e.g. --only 08) has nothing to schedule: replace this
+# process with the step so it owns the terminal (interactive input, Ctrl-C)
+# and no pipe plumbing or extra process is needed. The pipeline summary below
+# is skipped in that case; the step's own output and exit code are the result.
+# --in-process asks for the step to run inside this interpreter, so honor it.
+if (len(pipeline) == 1 and not args.in_process and os.name == "posix"
+        and STEPS[pipeline[0]].script in existing_scripts):
+    step = pipeline[0]
+    print(f"> [{step}] {STEPS[step].name}...", flush=True)
+    os.chdir(os.path.dirname(script_dir))
+    cmd = build_command(step)
+    os.execvpe(cmd[0], cmd, os.environ)
+
+if args.in_process:
+    # Steps share interpreter state (argv, cwd, stdout), so run them in order
+    for step in pipeline:
+        results[step] = run_step_in_process(step)
+        if not results[step] and not args.continue_on_error:
             break
+else:
+    asyncio.run(run_pipeline())
+failed = any(r is False for r in results.values())
+
+skipped = [step for step in pipeline if results.get(step) is None]
+if skipped:
+    print(f"\nPipeline stopped. Not run or stopped: {', '.join(skipped)}")
+    print("Use --continue-on-error to continue despite failures.")
 
 # ============================================================================
 # Summary
@@ -3,7 +3,7 @@
 Generates CSV files, PDF documents, and ontology configuration for testing.
 
 Usage:
-    python 01_generate_sample_data.py [--scenario <SCENARIO>] [--size small|medium|large]
+    python 01_generate_sample_data.py [--scenario <SCENARIO>|all] [--size small|medium|large]
 
 Scenarios:
     1. retail        - E-commerce products and customer orders (default)
@@ -12,6 +12,8 @@ Scenarios:
     4. supply_chain  - Suppliers, purchase orders, and inventory
     5. real_estate   - Property listings and agent performance
 
+    Use --scenario all to generate every scenario in parallel (one process each).
+
 Output:
     - CSV files for structured data (for Fabric Ontology)
     - PDF files for unstructured data (for AI Search)
@@ -20,33 +22,102 @@ Output:
 """
 
 import argparse
+import hashlib
 import os
+import re
+import sys
 import json
-import random
-from datetime import datetime, timedelta
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Faster JSON encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Typed Parquet copies of each table (optional; script 03 loads them in preference to CSV)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# PDF generation (reportlab preferred when installed: C-accelerated text metrics)
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
 
-# PDF generation
 try:
     from fpdf import FPDF
     FPDF_AVAILABLE = True
 except ImportError:
     FPDF_AVAILABLE = False
-    print("Note: fpdf2 not installed. Run 'pip install fpdf2' to generate PDF files.")
+    if not REPORTLAB_AVAILABLE:
+        print("Note: fpdf2 not installed. Run 'pip install fpdf2' to generate PDF files.")
 
 # ============================================================================
 # Parse Arguments
 # ============================================================================
 
+SCENARIO_NAMES = ["retail", "manufacturing", "saas", "supply_chain", "real_estate"]
+
 p = argparse.ArgumentParser(description="Generate sample data for industry scenario")
-p.add_argument("--scenario", default="retail", choices=["retail", "manufacturing", "saas", "supply_chain", "real_estate"],
-               help="Industry scenario (default: retail)")
+p.add_argument("--scenario", default="retail", choices=SCENARIO_NAMES + ["all"],
+               help="Industry scenario, or 'all' for every scenario (default: retail)")
 p.add_argument("--size", default="small", choices=["small", "medium", "large"],
                help="Data size: small=~20 rows, medium=~100 rows, large=~500 rows")
+p.add_argument("--no-env-update", action="store_true",
+               help="Don't write DATA_FOLDER to .env")
+p.add_argument("--seed", type=int,
+               help="Random seed for reproducible data; seeded output is cached and reused the same day")
 args = p.parse_args()
 
 scenario = args.scenario
 size = args.size
 
+# ============================================================================
+# All Scenarios (parallel)
+# ============================================================================
+
+if scenario == "all":
+    # Scenarios are independent and CPU-bound, so run each in its own process.
+    # Each writes its own timestamped folder; .env is left for the user to pick.
+    def run_one_scenario(name):
+        cmd = [sys.executable, os.path.abspath(__file__), "--scenario", name,
+               "--size", size, "--no-env-update"]
+        if args.seed is not None:
+            cmd += ["--seed", str(args.seed)]
+        return name, subprocess.run(cmd, capture_output=True, text=True)
+
+    failed = []
+    workers = min(len(SCENARIO_NAMES), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, result in pool.map(run_one_scenario, SCENARIO_NAMES):
+            print(result.stdout, end="")
+            if result.returncode != 0:
+                print(result.stderr, end="")
+                print(f"[FAIL] {name} (exit code {result.returncode})")
+                failed.append(name)
+
+    print(f"\n{'='*60}")
+    print(f"Generated {len(SCENARIO_NAMES) - len(failed)}/{len(SCENARIO_NAMES)} scenarios")
+    print(f"{'='*60}")
+    if not failed:
+        print("Set DATA_FOLDER in .env to the scenario folder you want to use.")
+    sys.exit(1 if failed else 0)
+
 # Size configuration
 SIZE_CONFIG = {
     "small": {"primary": 16, "secondary": 40},      # ~50 mins lab
@@ -72,6 +143,74 @@ os.makedirs(config_dir, exist_ok=True)
 os.makedirs(tables_dir, exist_ok=True)
 os.makedirs(docs_dir, exist_ok=True)
 
+# ============================================================================
+# .env Update Helper
+# ============================================================================
+
+DATA_FOLDER_RE = re.compile(r"^DATA_FOLDER=.*$", re.MULTILINE)
+
+
+def update_env_data_folder(data_folder_path):
+    """Point DATA_FOLDER in the project .env at data_folder_path"""
+    env_path = os.path.join(script_dir, "..", ".env")
+    if args.no_env_update:
+        return
+    if not os.path.exists(env_path):
+        print(f"Note: .env not found. Set DATA_FOLDER={data_folder_path} manually.")
+        return
+    
+    with open(env_path, "r") as f:
+        env_content = f.read()
+    
+    # Update DATA_FOLDER line in one pass (a function repl keeps Windows
+    # backslashes in the path literal)
+    data_folder_line = f"DATA_FOLDER={data_folder_path}"
+    env_content, updated = DATA_FOLDER_RE.subn(lambda m: data_folder_line, env_content, count=1)
+    
+    if not updated:
+        # Add it if not found
+        env_content = env_content.rstrip("\n") + f"\n{data_folder_line}\n"
+    
+    with open(env_path, "w") as f:
+        f.write(env_content)
+    
+    print(f"Updated .env with DATA_FOLDER={data_folder_path}")
+
+
+# ============================================================================
+# Seeded Output Cache
+# ============================================================================
+
+SEED_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "nc-iq-workshop", "data")
+
+
+def generator_version():
+    """Short hash of this script and template_data/*.json, so edits invalidate the cache"""
+    h = hashlib.blake2b(digest_size=8)
+    template_dir = os.path.join(script_dir, "template_data")
+    paths = [os.path.abspath(__file__)] + sorted(
+        os.path.join(template_dir, name) for name in os.listdir(template_dir) if name.endswith(".json"))
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# Seeded output only varies with the day (dates are relative to today) and the
+# generator version, so it is cached under both and later runs copy the folder
+# instead of regenerating it
+seed_cache_dir = None
+if args.seed is not None:
+    seed_cache_suffix = f"_{datetime.now():%Y%m%d}_{generator_version()}"
+    seed_cache_dir = os.path.join(SEED_CACHE_ROOT,
+                                  f"{scenario}_{size}_seed{args.seed}{seed_cache_suffix}")
+    if os.path.isdir(seed_cache_dir):
+        shutil.copytree(seed_cache_dir, data_dir, dirs_exist_ok=True)
+        print(f"[OK] Reused cached output for seed {args.seed}")
+        print(f"  Data folder: {os.path.abspath(data_dir)}")
+        update_env_data_folder(os.path.abspath(data_dir))
+        sys.exit(0)
+
 print(f"\n{'='*60}")
 print(f"Generating {size.upper()} sample data for: {scenario.upper()}")
 print(f"{'='*60}")
@@ -187,6 +326,32 @@ SCENARIOS = {
 # Data Generators
 # ============================================================================
 
+rng = np.random.default_rng(args.seed)
+
+
+def _codes(prefix, numbers, width):
+    """Format integer array as zero-padded codes, e.g. ("SKU", [1, 2], 5) -> SKU00001, SKU00002"""
+    return np.char.add(prefix, np.char.zfill(np.asarray(numbers).astype(str), width))
+
+
+def _pick(values, n):
+    """Sample n values uniformly (with replacement) as a NumPy array"""
+    return np.asarray(values)[rng.integers(0, len(values), size=n)]
+
+
+_date_tables = {}
+
+
+def _days_ago(low, high, n):
+    """n random dates between low and high days before today, as YYYY-MM-DD strings"""
+    # Format each offset once, then index the table per row
+    table = _date_tables.get(high)
+    if table is None:
+        today = np.datetime64(datetime.now().date())
+        table = _date_tables[high] = (today - np.arange(high + 1).astype("timedelta64[D]")).astype(str)
+    return table[rng.integers(low, high + 1, size=n)]
+
+
 def generate_retail_data(config):
     """Generate e-commerce products and customer orders"""
     # Realistic product data
@@ -216,33 +381,34 @@ def generate_retail_data(config):
     regions = ["North America", "Europe", "Asia Pacific", "Latin America"]
     channels = ["Website", "Mobile App", "Marketplace", "Social Commerce"]
     
-    products = []
-    for i in range(min(config["primary"], len(product_catalog))):
-        name, category, brand = product_catalog[i]
-        products.append({
-            "productId": f"SKU{i+1:05d}",
-            "productName": name,
-            "category": category,
-            "brand": brand,
-            "unitPrice": round(random.uniform(29.99, 1299.99), 2),
-            "stockLevel": random.randint(50, 500),
-            "reorderPoint": random.randint(20, 100)
-        })
-    
-    orders = []
-    for i in range(config["secondary"]):
-        prod = random.choice(products)
-        qty = random.randint(1, 5)
-        orders.append({
-            "orderId": f"ORD{i+1:06d}",
-            "productId": prod["productId"],
-            "customerId": f"CUST{random.randint(1, config['primary']*2):05d}",
-            "quantity": qty,
-            "totalAmount": round(prod["unitPrice"] * qty, 2),
-            "orderDate": (datetime.now() - timedelta(days=random.randint(0, 90))).strftime("%Y-%m-%d"),
-            "region": random.choice(regions),
-            "channel": random.choice(channels)
-        })
+    n_products = min(config["primary"], len(product_catalog))
+    names, categories, brands = zip(*product_catalog[:n_products])
+    product_ids = _codes("SKU", np.arange(1, n_products + 1), 5)
+    # Money as integer cents: totals are exact products, converted to dollars on output
+    unit_cents = rng.integers(2999, 130000, n_products)
+    products = pd.DataFrame({
+        "productId": product_ids,
+        "productName": names,
+        "category": categories,
+        "brand": brands,
+        "unitPrice": unit_cents / 100,
+        "stockLevel": rng.integers(50, 501, n_products),
+        "reorderPoint": rng.integers(20, 101, n_products)
+    })
+    
+    n = config["secondary"]
+    prod_idx = rng.integers(0, n_products, n)
+    qty = rng.integers(1, 6, n)
+    orders = pd.DataFrame({
+        "orderId": _codes("ORD", np.arange(1, n + 1), 6),
+        "productId": product_ids[prod_idx],
+        "customerId": _codes("CUST", rng.integers(1, config["primary"] * 2 + 1, n), 5),
+        "quantity": qty,
+        "totalAmount": unit_cents[prod_idx] * qty / 100,
+        "orderDate": _days_ago(0, 90, n),
+        "region": _pick(regions, n),
+        "channel": _pick(channels, n)
+    })
     
     return {"products": products, "orders": orders}
 
@@ -266,33 +432,34 @@ def generate_manufacturing_data(config):
     statuses = ["Operational", "Operational", "Operational", "Maintenance", "Idle"]
     product_codes = ["PROD-A100", "PROD-B200", "PROD-C300", "PROD-D400", "PROD-E500"]
     
-    equipment = []
-    for i in range(min(config["primary"], len(equipment_types) * 2)):
-        eq_name, manufacturer = equipment_types[i % len(equipment_types)]
-        equipment.append({
-            "equipmentId": f"EQ{i+1:04d}",
-            "equipmentName": f"{eq_name} #{i//len(equipment_types)+1}",
-            "productionLine": random.choice(production_lines),
-            "manufacturer": manufacturer,
-            "installDate": (datetime.now() - timedelta(days=random.randint(365, 2000))).strftime("%Y-%m-%d"),
-            "status": random.choice(statuses),
-            "efficiency": round(random.uniform(0.75, 0.98), 2)
-        })
-    
-    production_runs = []
-    for i in range(config["secondary"]):
-        eq = random.choice(equipment)
-        units = random.randint(100, 1000)
-        production_runs.append({
-            "runId": f"RUN{i+1:06d}",
-            "equipmentId": eq["equipmentId"],
-            "productCode": random.choice(product_codes),
-            "unitsProduced": units,
-            "defectCount": random.randint(0, int(units * 0.05)),  # 0-5% defect rate
-            "runDate": (datetime.now() - timedelta(days=random.randint(0, 60))).strftime("%Y-%m-%d"),
-            "shift": random.choice(shifts),
-            "operatorId": f"OP{random.randint(1, 20):03d}"
-        })
+    # Catalog as parallel arrays (name, manufacturer) indexed by position
+    type_names, type_makers = map(np.array, zip(*equipment_types))
+    n_equipment = min(config["primary"], len(equipment_types) * 2)
+    type_idx = np.arange(n_equipment) % len(equipment_types)
+    copy_no = (np.arange(n_equipment) // len(equipment_types) + 1).astype(str)
+    equipment_ids = _codes("EQ", np.arange(1, n_equipment + 1), 4)
+    equipment = pd.DataFrame({
+        "equipmentId": equipment_ids,
+        "equipmentName": np.char.add(np.char.add(type_names[type_idx], " #"), copy_no),
+        "productionLine": _pick(production_lines, n_equipment),
+        "manufacturer": type_makers[type_idx],
+        "installDate": _days_ago(365, 2000, n_equipment),
+        "status": _pick(statuses, n_equipment),
+        "efficiency": rng.uniform(0.75, 0.98, n_equipment).round(2)
+    })
+    
+    n = config["secondary"]
+    units = rng.integers(100, 1001, n)
+    production_runs = pd.DataFrame({
+        "runId": _codes("RUN", np.arange(1, n + 1), 6),
+        "equipmentId": _pick(equipment_ids, n),
+        "productCode": _pick(product_codes, n),
+        "unitsProduced": units,
+        "defectCount": rng.integers(0, (units * 0.05).astype(int) + 1),  # 0-5% defect rate
+        "runDate": _days_ago(0, 60, n),
+        "shift": _pick(shifts, n),
+        "operatorId": _codes("OP", rng.integers(1, 21, n), 3)
+    })
     
     return {"equipment": equipment, "production_runs": production_runs}
 
@@ -306,33 +473,33 @@ def generate_saas_data(config):
     account_managers = ["Sarah Chen", "Michael Rodriguez", "Emily Watson", "James Kim", "Lisa Thompson"]
     features = ["Dashboard", "Reports", "API Integration", "User Management", "Automation", "Analytics", "Export", "Collaboration"]
     
-    customers = []
-    for i in range(config["primary"]):
-        plan = random.choice(plans)
-        mrr_range = plan_mrr[plan]
-        customers.append({
-            "customerId": f"ACCT{i+1:05d}",
-            "companyName": f"{random.choice(company_prefixes)} {random.choice(company_suffixes)}",
-            "industry": random.choice(industries),
-            "plan": plan,
-            "mrr": round(random.uniform(*mrr_range), 2),
-            "startDate": (datetime.now() - timedelta(days=random.randint(30, 730))).strftime("%Y-%m-%d"),
-            "accountManager": random.choice(account_managers),
-            "healthScore": random.randint(40, 100)
-        })
-    
-    usage_events = []
-    for i in range(config["secondary"]):
-        cust = random.choice(customers)
-        usage_events.append({
-            "eventId": f"EVT{i+1:07d}",
-            "customerId": cust["customerId"],
-            "feature": random.choice(features),
-            "eventCount": random.randint(10, 500),
-            "eventDate": (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d"),
-            "userCount": random.randint(1, 50),
-            "sessionMinutes": random.randint(5, 180)
-        })
+    n_customers = config["primary"]
+    plan_idx = rng.integers(0, len(plans), n_customers)
+    mrr_low = np.array([plan_mrr[plan][0] for plan in plans])[plan_idx]
+    mrr_high = np.array([plan_mrr[plan][1] for plan in plans])[plan_idx]
+    customer_ids = _codes("ACCT", np.arange(1, n_customers + 1), 5)
+    customers = pd.DataFrame({
+        "customerId": customer_ids,
+        "companyName": np.char.add(np.char.add(_pick(company_prefixes, n_customers), " "),
+                                   _pick(company_suffixes, n_customers)),
+        "industry": _pick(industries, n_customers),
+        "plan": np.array(plans)[plan_idx],
+        "mrr": rng.uniform(mrr_low, mrr_high).round(2),
+        "startDate": _days_ago(30, 730, n_customers),
+        "accountManager": _pick(account_managers, n_customers),
+        "healthScore": rng.integers(40, 101, n_customers)
+    })
+    
+    n = config["secondary"]
+    usage_events = pd.DataFrame({
+        "eventId": _codes("EVT", np.arange(1, n + 1), 7),
+        "customerId": _pick(customer_ids, n),
+        "feature": _pick(features, n),
+        "eventCount": rng.integers(10, 501, n),
+        "eventDate": _days_ago(0, 30, n),
+        "userCount": rng.integers(1, 51, n),
+        "sessionMinutes": rng.integers(5, 181, n)
+    })
     
     return {"customers": customers, "usage_events": usage_events}
 
@@ -359,34 +526,32 @@ def generate_supply_chain_data(config):
         "Copper Wire", "Ball Bearings", "LCD Displays", "Rubber Seals"
     ]
     
-    suppliers = []
-    for i in range(min(config["primary"], len(supplier_data))):
-        name, country, category = supplier_data[i]
-        suppliers.append({
-            "supplierId": f"SUP{i+1:04d}",
-            "supplierName": name,
-            "country": country,
-            "category": category,
-            "rating": round(random.uniform(3.5, 5.0), 1),
-            "leadTimeDays": random.randint(7, 45),
-            "paymentTerms": random.choice(payment_terms)
-        })
-    
-    purchase_orders = []
-    for i in range(config["secondary"]):
-        sup = random.choice(suppliers)
-        qty = random.randint(100, 5000)
-        unit_cost = round(random.uniform(5, 500), 2)
-        purchase_orders.append({
-            "poNumber": f"PO{i+1:06d}",
-            "supplierId": sup["supplierId"],
-            "itemDescription": random.choice(items),
-            "quantity": qty,
-            "unitCost": unit_cost,
-            "totalCost": round(qty * unit_cost, 2),
-            "orderDate": (datetime.now() - timedelta(days=random.randint(0, 90))).strftime("%Y-%m-%d"),
-            "status": random.choice(statuses)
-        })
+    n_suppliers = min(config["primary"], len(supplier_data))
+    names, countries, categories = zip(*supplier_data[:n_suppliers])
+    supplier_ids = _codes("SUP", np.arange(1, n_suppliers + 1), 4)
+    suppliers = pd.DataFrame({
+        "supplierId": supplier_ids,
+        "supplierName": names,
+        "country": countries,
+        "category": categories,
+        "rating": rng.uniform(3.5, 5.0, n_suppliers).round(1),
+        "leadTimeDays": rng.integers(7, 46, n_suppliers),
+        "paymentTerms": _pick(payment_terms, n_suppliers)
+    })
+    
+    n = config["secondary"]
+    qty = rng.integers(100, 5001, n)
+    unit_cost_cents = rng.integers(500, 50001, n)  # Integer cents, as in retail
+    purchase_orders = pd.DataFrame({
+        "poNumber": _codes("PO", np.arange(1, n + 1), 6),
+        "supplierId": _pick(supplier_ids, n),
+        "itemDescription": _pick(items, n),
+        "quantity": qty,
+        "unitCost": unit_cost_cents / 100,
+        "totalCost": qty * unit_cost_cents / 100,
+        "orderDate": _days_ago(0, 90, n),
+        "status": _pick(statuses, n)
+    })
     
     return {"suppliers": suppliers, "purchase_orders": purchase_orders}
 
@@ -401,261 +566,145 @@ def generate_real_estate_data(config):
     street_names = ["Oak", "Maple", "Cedar", "Pine", "Elm", "Birch", "Willow", "Cypress"]
     street_types = ["Street", "Avenue", "Drive", "Lane", "Court", "Place", "Way", "Boulevard"]
     
-    properties = []
-    for i in range(config["primary"]):
-        city = random.choice(cities)
-        prop_type = random.choice(property_types)
-        sqft = random.randint(800, 4500)
-        bedrooms = random.randint(1, 5)
-        properties.append({
-            "propertyId": f"MLS{i+1:06d}",
-            "address": f"{random.randint(100, 9999)} {random.choice(street_names)} {random.choice(street_types)}",
-            "city": city,
-            "propertyType": prop_type,
-            "bedrooms": bedrooms,
-            "squareFeet": sqft,
-            "listPrice": round(random.uniform(250000, 1500000), -3),  # Round to nearest 1000
-            "status": random.choice(statuses)
-        })
-    
-    transactions = []
-    sold_properties = [p for p in properties if p["status"] == "Sold"]
-    if not sold_properties:
-        sold_properties = properties[:len(properties)//3]
-    
-    for i in range(min(config["secondary"], len(sold_properties) * 2)):
-        prop = random.choice(sold_properties)
-        list_price = prop["listPrice"]
-        sale_variance = random.uniform(-0.05, 0.03)  # -5% to +3% of list
-        transactions.append({
-            "transactionId": f"TXN{i+1:06d}",
-            "propertyId": prop["propertyId"],
-            "agentId": f"AGT{agents.index(random.choice(agents))+1:03d}",
-            "salePrice": round(list_price * (1 + sale_variance), -2),
-            "saleDate": (datetime.now() - timedelta(days=random.randint(0, 180))).strftime("%Y-%m-%d"),
-            "daysOnMarket": random.randint(7, 120),
-            "buyerType": random.choice(buyer_types)
-        })
+    n_properties = config["primary"]
+    property_ids = _codes("MLS", np.arange(1, n_properties + 1), 6)
+    list_prices = rng.uniform(250000, 1500000, n_properties).round(-3)  # Round to nearest 1000
+    property_statuses = _pick(statuses, n_properties)
+    addresses = np.char.add(rng.integers(100, 10000, n_properties).astype(str), " ")
+    addresses = np.char.add(np.char.add(addresses, _pick(street_names, n_properties)), " ")
+    properties = pd.DataFrame({
+        "propertyId": property_ids,
+        "address": np.char.add(addresses, _pick(street_types, n_properties)),
+        "city": _pick(cities, n_properties),
+        "propertyType": _pick(property_types, n_properties),
+        "bedrooms": rng.integers(1, 6, n_properties),
+        "squareFeet": rng.integers(800, 4501, n_properties),
+        "listPrice": list_prices,
+        "status": property_statuses
+    })
+    
+    # Positions of sold properties; only their id/price columns are needed below
+    sold = np.flatnonzero(property_statuses == "Sold")
+    if len(sold) == 0:
+        sold = np.arange(n_properties // 3)
+    
+    n = min(config["secondary"], len(sold) * 2)
+    sold_idx = sold[rng.integers(0, max(len(sold), 1), n)] if n else sold[:0]
+    sale_variance = rng.uniform(-0.05, 0.03, n)  # -5% to +3% of list
+    transactions = pd.DataFrame({
+        "transactionId": _codes("TXN", np.arange(1, n + 1), 6),
+        "propertyId": property_ids[sold_idx],
+        "agentId": _codes("AGT", rng.integers(1, len(agents) + 1, n), 3),
+        "salePrice": (list_prices[sold_idx] * (1 + sale_variance)).round(-2),
+        "saleDate": _days_ago(0, 180, n),
+        "daysOnMarket": rng.integers(7, 121, n),
+        "buyerType": _pick(buyer_types, n)
+    })
     
     return {"properties": properties, "transactions": transactions}
 
 # ============================================================================
-# PDF Document Definitions (Unstructured Data for AI Search)
+# PDF Document and Question Definitions (template_data/*.json)
 # ============================================================================
 
-PDF_DOCUMENTS = {
-    "retail": [
-        {
-            "filename": "return_policy.pdf",
-            "title": "E-Commerce Return and Refund Policy",
-            "sections": [
-                ("Return Window", "All products can be returned within 30 days of delivery. Electronics have a 15-day return window. Items must be in original condition with all packaging and accessories. Proof of purchase is required for all returns."),
-                ("Refund Process", "Refunds are processed within 5-7 business days after receiving the returned item. Original payment method will be credited. Shipping costs are non-refundable unless the return is due to our error or a defective product."),
-                ("Exchange Policy", "Exchanges are subject to product availability. If the desired item is unavailable, a full refund will be issued. Free exchange shipping on defective items. Size exchanges in Apparel are always free."),
-                ("Non-Returnable Items", "Personalized items cannot be returned. Final sale items marked at checkout. Opened software and digital products. Items damaged through misuse or normal wear."),
-                ("International Returns", "International customers are responsible for return shipping costs. Customs duties and taxes are non-refundable. Contact customer service for return authorization before shipping internationally."),
-            ]
-        },
-        {
-            "filename": "shipping_guide.pdf",
-            "title": "Shipping and Delivery Guide",
-            "sections": [
-                ("Shipping Options", "Standard Shipping (5-7 business days) is free on orders over $50. Express Shipping (2-3 days) available for $12.99. Next-Day Delivery available for $24.99 on orders placed before 2 PM EST."),
-                ("Regional Coverage", "North America: Full coverage with all shipping options. Europe: Standard and Express available, 7-14 business days. Asia Pacific: Standard shipping 10-21 business days. Latin America: Available to select countries."),
-                ("Order Tracking", "Tracking numbers sent via email within 24 hours of shipment. Real-time updates available through our website and mobile app. SMS notifications available for Express and Next-Day orders."),
-                ("Large Item Delivery", "Items over 50 lbs require special handling. White glove delivery available for furniture and large electronics. Appointment scheduling required for large item delivery."),
-                ("Holiday Shipping", "Extended cutoff times during peak season. Holiday shipping surcharges may apply. Check website for guaranteed delivery dates during November-December."),
-            ]
-        },
-        {
-            "filename": "loyalty_rewards.pdf",
-            "title": "Rewards Program Terms and Benefits",
-            "sections": [
-                ("Earning Points", "Earn 1 point per dollar spent on all purchases. Bonus points during promotional events. Double points on Electronics and Sports categories. Points are credited within 48 hours of delivery."),
-                ("Membership Tiers", "Silver (0-1000 points): 5% off first purchase, birthday reward. Gold (1001-5000 points): 10% off all purchases, free Express shipping. Platinum (5001+ points): 15% off, free Next-Day shipping, early access to sales."),
-                ("Redeeming Rewards", "500 points = $5 reward. Rewards can be combined with sales and promotions. Points expire 12 months after earning. Rewards expire 60 days after issuance."),
-                ("Exclusive Benefits", "Members-only flash sales every month. Early access to new product launches. Exclusive member pricing on select items. Priority customer service line."),
-                ("Partner Benefits", "Earn points at partner restaurants and hotels. Transfer points to airline miles programs. Special financing through partner credit card."),
-            ]
-        },
-    ],
-    "manufacturing": [
-        {
-            "filename": "quality_standards.pdf",
-            "title": "Quality Control Standards and Procedures",
-            "sections": [
-                ("Quality Philosophy", "Our commitment to zero defects drives continuous improvement across all production lines. We adhere to ISO 9001:2015 standards and conduct regular third-party audits. Quality is everyone's responsibility."),
-                ("Inspection Protocols", "First Article Inspection (FAI) required for all new production runs. In-process inspection at critical control points. Final inspection before packaging with statistical sampling. 100% inspection for aerospace and automotive components."),
-                ("Defect Classification", "Critical defects: Safety hazard or non-functional - 0% acceptance rate. Major defects: Reduced usability - max 1% acceptance. Minor defects: Cosmetic issues - max 2.5% acceptance."),
-                ("Equipment Calibration", "All measurement equipment calibrated quarterly. Calibration records maintained for 7 years. Out-of-calibration equipment immediately removed from service. Traceability to NIST standards required."),
-                ("Corrective Actions", "8D methodology for problem solving. Root cause analysis required within 48 hours. Corrective actions verified within 30 days. Lessons learned shared across all production lines."),
-            ]
-        },
-        {
-            "filename": "maintenance_procedures.pdf",
-            "title": "Equipment Maintenance Manual",
-            "sections": [
-                ("Preventive Maintenance", "Daily visual inspections by operators. Weekly lubrication and cleaning schedules. Monthly comprehensive inspections by maintenance team. Annual overhauls for critical equipment."),
-                ("Predictive Maintenance", "Vibration analysis on rotating equipment quarterly. Thermal imaging for electrical systems monthly. Oil analysis for hydraulic systems every 500 hours. Ultrasonic testing for early failure detection."),
-                ("Breakdown Response", "Immediate notification to maintenance team and shift supervisor. Safety lockout/tagout procedures must be followed. Root cause analysis within 24 hours of repair. Update maintenance records within 4 hours of completion."),
-                ("Spare Parts Management", "Critical spares inventory maintained on-site. Minimum stock levels reviewed monthly. Vendor lead times tracked and updated quarterly. Emergency supplier agreements for critical components."),
-                ("Efficiency Targets", "Overall Equipment Effectiveness (OEE) target: 85%. Planned downtime maximum: 5% of operating hours. Unplanned downtime target: less than 2%. Mean Time Between Failures (MTBF) tracked by equipment type."),
-            ]
-        },
-        {
-            "filename": "safety_guidelines.pdf",
-            "title": "Manufacturing Safety Guidelines",
-            "sections": [
-                ("Personal Protective Equipment", "Safety glasses required in all production areas. Steel-toed boots mandatory. Hearing protection required where noise exceeds 85 dB. Cut-resistant gloves for material handling. High-visibility vests in forklift zones."),
-                ("Machine Safety", "Guards must be in place before operation. Lockout/Tagout for all maintenance activities. Emergency stop buttons tested weekly. No loose clothing or jewelry near rotating equipment."),
-                ("Material Handling", "Maximum lift weight: 50 lbs without assistance. Powered equipment required for loads over 50 lbs. Proper lifting technique training required annually. Clear pathways maintained at all times."),
-                ("Emergency Procedures", "Emergency exits clearly marked and unobstructed. Fire extinguisher locations posted. Evacuation drills conducted quarterly. First aid stations in each production area. Emergency contact numbers posted prominently."),
-                ("Incident Reporting", "All incidents reported within 1 hour. Near-miss reporting encouraged and anonymous. Safety committee reviews all incidents weekly. Corrective actions tracked to completion."),
-            ]
-        },
-    ],
-    "saas": [
-        {
-            "filename": "service_level_agreement.pdf",
-            "title": "Service Level Agreement (SLA)",
-            "sections": [
-                ("Uptime Commitment", "We guarantee 99.9% uptime for all paid plans. Scheduled maintenance windows: Sundays 2-4 AM EST with 72-hour notice. Uptime calculated monthly excluding scheduled maintenance. Status page available at status.ourplatform.com."),
-                ("Support Response Times", "Enterprise Plus: 15-minute response, 24/7 phone support. Enterprise: 1-hour response, business hours phone. Professional: 4-hour response, email and chat. Starter: 24-hour response, email only."),
-                ("Service Credits", "99.0-99.9% uptime: 10% credit. 95.0-99.0% uptime: 25% credit. Below 95%: 50% credit. Credits applied to next invoice automatically. Maximum credit: one month's fees."),
-                ("Data Protection", "Daily automated backups retained for 30 days. Point-in-time recovery available for Enterprise plans. Data encrypted at rest (AES-256) and in transit (TLS 1.3). Annual SOC 2 Type II audit conducted."),
-                ("Support Escalation", "Level 1: Technical support team. Level 2: Senior engineers (4-hour escalation). Level 3: Engineering leadership (8-hour escalation). Executive escalation available for Enterprise Plus customers."),
-            ]
-        },
-        {
-            "filename": "api_documentation.pdf",
-            "title": "API Integration Guide",
-            "sections": [
-                ("Authentication", "API uses OAuth 2.0 for authentication. Access tokens expire after 1 hour. Refresh tokens valid for 30 days. API keys available for server-to-server integration. Rate limits: Starter 100/min, Professional 500/min, Enterprise 2000/min."),
-                ("Core Endpoints", "GET /api/v2/users - List all users with pagination. POST /api/v2/data - Submit data with JSON payload. GET /api/v2/reports - Generate reports with date range filters. DELETE /api/v2/records/{id} - Soft delete with 30-day recovery."),
-                ("Webhooks", "Real-time event notifications to your endpoint. Events: user.created, data.updated, report.completed. Retry logic: 3 attempts with exponential backoff. Webhook signatures for security verification."),
-                ("Best Practices", "Use pagination for large data sets. Implement exponential backoff for rate limits. Cache responses where appropriate. Use bulk endpoints for batch operations."),
-                ("SDK Support", "Official SDKs: Python, JavaScript, Java, .NET. Community SDKs: Ruby, Go, PHP. Postman collection available for testing. Sandbox environment for development."),
-            ]
-        },
-        {
-            "filename": "customer_success_playbook.pdf",
-            "title": "Customer Success Playbook",
-            "sections": [
-                ("Onboarding Journey", "Week 1: Kickoff call, account setup, user provisioning. Week 2-3: Training sessions on core features. Week 4: First value milestone checkpoint. Day 30: Business review and adoption metrics. Day 60: Advanced feature training."),
-                ("Health Score Methodology", "Product usage (40%): DAU/MAU ratio, feature adoption. Engagement (30%): Support tickets, NPS responses, training completion. Financial (30%): Payment history, expansion conversations, contract terms."),
-                ("At-Risk Playbook", "Health Score 40-60: Proactive outreach within 48 hours. Health Score below 40: Executive escalation and recovery plan. Key indicators: Declining logins, support ticket sentiment, missed meetings."),
-                ("Expansion Signals", "High feature utilization approaching plan limits. Multiple users requesting advanced features. Positive feedback in support interactions. Growing user count within account."),
-                ("Renewal Process", "90 days out: Renewal review meeting scheduled. 60 days: Proposal delivered with usage summary. 30 days: Contract negotiation finalized. Day 0: Renewal celebration and next-year goals."),
-            ]
-        },
-    ],
-    "supply_chain": [
-        {
-            "filename": "supplier_handbook.pdf",
-            "title": "Supplier Requirements Handbook",
-            "sections": [
-                ("Quality Requirements", "ISO 9001 certification required for Tier 1 suppliers. First Article Approval required for all new parts. Certificate of Conformance with each shipment. Annual quality audits conducted by our team."),
-                ("Delivery Standards", "On-time delivery target: 98%. Delivery windows: +/- 2 days of scheduled date. Advance Ship Notice (ASN) required 24 hours before shipment. Packaging specifications must be followed exactly."),
-                ("Documentation", "Material Test Reports required for raw materials. Country of origin documentation for all shipments. Hazardous materials require SDS sheets. Invoice must match PO exactly for payment processing."),
-                ("Communication Protocols", "Respond to inquiries within 24 business hours. Capacity constraints communicated 30 days in advance. Quality issues reported within 4 hours of discovery. Single point of contact assigned for each account."),
-                ("Sustainability Standards", "Environmental compliance certifications required. Conflict minerals reporting for applicable materials. Packaging recyclability requirements. Carbon footprint reporting encouraged."),
-            ]
-        },
-        {
-            "filename": "inventory_policy.pdf",
-            "title": "Inventory Management Policy",
-            "sections": [
-                ("Stock Levels", "Safety stock: 2 weeks supply for A-items. Reorder point calculated from lead time + safety stock. Maximum stock level: 6 weeks supply. Dead stock review conducted quarterly."),
-                ("ABC Classification", "A-items (top 20% by value): Daily monitoring. B-items (next 30%): Weekly review. C-items (remaining 50%): Monthly review. Classification updated annually."),
-                ("Counting Procedures", "A-items: Cycle count monthly. B-items: Cycle count quarterly. C-items: Annual physical inventory. Discrepancies over 2% require root cause analysis."),
-                ("Obsolescence Management", "Slow-moving items flagged after 90 days no movement. Review board meets monthly for disposition. Options: Return to supplier, discount sale, scrap. Reserve established for excess and obsolete."),
-                ("KPIs and Targets", "Inventory turns target: 8x annually. Fill rate target: 98.5%. Carrying cost target: 20% of inventory value. Accuracy target: 99% after cycle counts."),
-            ]
-        },
-        {
-            "filename": "procurement_guidelines.pdf",
-            "title": "Procurement Process Guidelines",
-            "sections": [
-                ("Purchase Authority", "Under $1,000: Department manager approval. $1,000-$10,000: Director approval. $10,000-$50,000: VP approval. Over $50,000: Executive committee approval."),
-                ("Vendor Selection", "Minimum 3 quotes for purchases over $5,000. Sole source justification required and documented. New vendors require qualification process. Preferred vendor list maintained and reviewed quarterly."),
-                ("PO Process", "Requisition submitted through procurement system. Approvals routed automatically based on amount. PO issued within 24 hours of final approval. Changes require PO amendment with approvals."),
-                ("Payment Terms", "Standard terms: Net 30. Early payment discount: 2% Net 10 evaluated monthly. Payment requires 3-way match: PO, receipt, invoice. Disputes escalated to procurement manager."),
-                ("Contract Management", "Multi-year agreements reviewed annually. Price adjustments capped per contract terms. Performance metrics tracked quarterly. Renewal process begins 90 days before expiration."),
-            ]
-        },
-    ],
-    "real_estate": [
-        {
-            "filename": "market_analysis_guide.pdf",
-            "title": "Real Estate Market Analysis Guide",
-            "sections": [
-                ("Comparable Analysis", "Select 3-5 comparable properties within 1 mile. Adjustments made for square footage, bedrooms, lot size. Recent sales (90 days) weighted more heavily. Consider days on market as demand indicator."),
-                ("Pricing Strategy", "Competitive pricing: 2-5% below average for quick sale. Market pricing: At comparable average for balanced approach. Premium pricing: 5-10% above for unique features. Price reductions: Consider after 21 days without offers."),
-                ("Market Indicators", "Absorption rate: Months of inventory at current pace. Price per square foot trends. Days on market averages. List-to-sale price ratios."),
-                ("Seasonal Patterns", "Spring (March-May): Peak buying season, highest prices. Summer (June-August): Family-friendly moves, competitive. Fall (September-November): Serious buyers, negotiable. Winter (December-February): Lower volume, motivated parties."),
-                ("Investment Analysis", "Cap rate benchmarks by property type and market. Cash-on-cash return expectations. 1% rule for rental property screening. Pro forma templates for multi-family evaluation."),
-            ]
-        },
-        {
-            "filename": "listing_agreement.pdf",
-            "title": "Listing Agreement Terms and Conditions",
-            "sections": [
-                ("Agreement Duration", "Standard listing period: 6 months. Exclusive right to sell during agreement period. 30-day notice required for cancellation. Automatic renewal provisions if not cancelled."),
-                ("Commission Structure", "Standard commission: 6% of sale price. Commission split between listing and buyer agents. Reduced commission for dual agency situations. Commission earned at closing."),
-                ("Marketing Commitment", "Professional photography included. MLS listing within 48 hours of signing. Virtual tour and floor plan. Social media and digital marketing. Open houses as agreed."),
-                ("Seller Obligations", "Property must be available for showings with reasonable notice. Material defects must be disclosed. Cooperate with appraisal and inspection processes. Maintain property condition through closing."),
-                ("Termination Clauses", "Mutual agreement to terminate. Breach by either party. Sale to exempted buyer if specified. Listing agent may withdraw for cause."),
-            ]
-        },
-        {
-            "filename": "closing_checklist.pdf",
-            "title": "Transaction Closing Checklist",
-            "sections": [
-                ("Pre-Closing Tasks", "Title search and insurance commitment. Home inspection completed and negotiations resolved. Appraisal completed and value confirmed. Loan approval and final underwriting. Walk-through scheduled 24-48 hours before closing."),
-                ("Required Documents", "Government-issued ID for all parties. Proof of homeowners insurance. Certified funds for closing costs. Power of attorney if applicable. Trust documents if purchasing in trust."),
-                ("Closing Day", "Review closing disclosure (3 days before). Sign all documents (allow 1-2 hours). Fund transfer verification. Key exchange and possession. Recording of deed (same or next day)."),
-                ("Post-Closing", "Deed recorded with county. Title policy issued within 30 days. Change of address and utilities. Property tax notification. Keep closing documents permanently."),
-                ("Common Issues", "Last-minute loan conditions. Walk-through discrepancies. Wire fraud prevention verification. Document errors requiring correction. Funding delays."),
-            ]
-        },
-    ],
-}
+PDF_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nc-iq-workshop", "pdfs")
+
+
+def load_template_data(filename):
+    """Load a JSON file from template_data/ (read only when that output is generated)"""
+    with open(os.path.join(script_dir, "template_data", filename), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_pdf_reportlab(doc, filepath):
+    """Lay out one document with reportlab's canvas (same layout as the fpdf2 path)"""
+    page_width, page_height = A4
+    margin = 42  # ~15 mm
+    text_width = page_width - 2 * margin
+    c = canvas.Canvas(filepath, pagesize=A4)
+    y = page_height - margin
+    
+    def draw_lines(lines, font, size, leading, centered=False):
+        nonlocal y
+        c.setFont(font, size)
+        for line in lines:
+            if y - leading < margin:
+                c.showPage()
+                c.setFont(font, size)
+                y = page_height - margin
+            y -= leading
+            if centered:
+                c.drawCentredString(page_width / 2, y, line)
+            else:
+                c.drawString(margin, y, line)
+    
+    # Title
+    draw_lines([doc["title"]], "Helvetica-Bold", 20, 42, centered=True)
+    y -= 28
+    
+    # Sections
+    for section_title, section_content in doc["sections"]:
+        draw_lines([section_title], "Helvetica-Bold", 12, 23)
+        draw_lines(simpleSplit(section_content, "Helvetica", 10, text_width), "Helvetica", 10, 17)
+        y -= 14
+    
+    c.save()
+
+
+def _write_pdf_fpdf(doc, filepath):
+    """Lay out one document with fpdf2"""
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    
+    # Title
+    pdf.set_font("Helvetica", "B", 20)
+    pdf.cell(0, 15, doc["title"], ln=True, align="C")
+    pdf.ln(10)
+    
+    # Sections
+    for section_title, section_content in doc["sections"]:
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.cell(0, 8, section_title, ln=True)
+        
+        pdf.set_font("Helvetica", "", 10)
+        pdf.multi_cell(0, 6, section_content)
+        pdf.ln(5)
+    
+    pdf.output(filepath)
+
 
 def generate_pdf_documents(scenario, docs_dir):
     """Generate PDF documents for the given scenario"""
-    if not FPDF_AVAILABLE:
+    if not (REPORTLAB_AVAILABLE or FPDF_AVAILABLE):
         print("\n⚠️  Skipping PDF generation (fpdf2 not installed)")
         print("   Install with: pip install fpdf2")
         return []
     
-    documents = PDF_DOCUMENTS.get(scenario, [])
+    documents = load_template_data("pdf_documents.json").get(scenario, [])
     if not documents:
         return []
     
     generated_files = []
     
+    # Documents are rendered sequentially: each takes ~10 ms, less than the cost
+    # of starting worker processes (--scenario all parallelizes across scenarios)
+    write_pdf = _write_pdf_reportlab if REPORTLAB_AVAILABLE else _write_pdf_fpdf
     for doc in documents:
         filepath = os.path.join(docs_dir, doc["filename"])
-        
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        
-        # Title
-        pdf.set_font("Helvetica", "B", 20)
-        pdf.cell(0, 15, doc["title"], ln=True, align="C")
-        pdf.ln(10)
-        
-        # Sections
-        for section_title, section_content in doc["sections"]:
-            pdf.set_font("Helvetica", "B", 12)
-            pdf.cell(0, 8, section_title, ln=True)
-            
-            pdf.set_font("Helvetica", "", 10)
-            pdf.multi_cell(0, 6, section_content)
-            pdf.ln(5)
-        
-        pdf.output(filepath)
+        # Rendered PDFs are cached by a hash of their text and renderer
+        key = hashlib.blake2b(json.dumps([write_pdf.__name__, doc]).encode("utf-8"),
+                              digest_size=16).hexdigest()
+        cached_path = os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+        if os.path.exists(cached_path):
+            shutil.copyfile(cached_path, filepath)
+        else:
+            write_pdf(doc, filepath)
+            try:
+                os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+                shutil.copyfile(filepath, cached_path)
+            except OSError:
+                pass  # Cache is optional
         generated_files.append(doc["filename"])
     
     return generated_files
@@ -670,17 +719,20 @@ data = generator(config)
 
 # Write CSV files
 print(f"\nGenerating CSV files in: {tables_dir}")
-for table_name, rows in data.items():
+for table_name, df in data.items():
     csv_path = os.path.join(tables_dir, f"{table_name}.csv")
     columns = scenario_def["tables"][table_name]["columns"]
+    # 1 MiB buffer: a large table is flushed in a few write() calls instead of per 8 KB
+    with open(csv_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        df.to_csv(f, columns=columns, index=False)
     
-    with open(csv_path, "w", encoding="utf-8") as f:
-        f.write(",".join(columns) + "\n")
-        for row in rows:
-            values = [str(row.get(col, "")) for col in columns]
-            f.write(",".join(values) + "\n")
+    print(f"  [OK] {table_name}.csv ({len(df)} rows)")
     
-    print(f"  [OK] {table_name}.csv ({len(rows)} rows)")
+    if PYARROW_AVAILABLE:
+        # Built straight from the NumPy-backed columns by Arrow's C++ writer
+        table = pa.Table.from_pandas(df[columns], preserve_index=False)
+        pq.write_table(table, os.path.join(tables_dir, f"{table_name}.parquet"))
+        print(f"  [OK] {table_name}.parquet")
 
 # ============================================================================
 # Generate Ontology Configuration
@@ -703,8 +755,12 @@ for table_name, table_def in scenario_def["tables"].items():
     }
 
 config_path = os.path.join(config_dir, "ontology_config.json")
-with open(config_path, "w", encoding="utf-8") as f:
-    json.dump(ontology_config, f, indent=2)
+with open(config_path, "wb") as f:
+    # One write: json.dump() with indent issues a write() per token
+    if ORJSON_AVAILABLE:
+        f.write(orjson.dumps(ontology_config, option=orjson.OPT_INDENT_2))
+    else:
+        f.write(json.dumps(ontology_config, indent=2).encode("utf-8"))
 
 print(f"  [OK] config/ontology_config.json")
 
@@ -712,74 +768,11 @@ print(f"  [OK] config/ontology_config.json")
 # Generate Sample Questions
 # ============================================================================
 
-SAMPLE_QUESTIONS = {
-    "retail": [
-        "What is the total revenue by product category?",
-        "Which products are below their reorder point?",
-        "Show me the top 5 best-selling products by quantity",
-        "What is the average order value by sales channel?",
-        "Which region has the highest total sales?",
-        "How many orders were placed through the Mobile App?",
-        "What is the revenue trend by month?",
-        "Which brand has the highest average unit price?",
-        "List products with low stock levels (under 100 units)",
-        "What is the total quantity sold per product with product details?",
-    ],
-    "manufacturing": [
-        "What is the overall defect rate across all production runs?",
-        "Which equipment has the highest efficiency rating?",
-        "Show defect counts by production line",
-        "Which shift has the highest production output?",
-        "List equipment currently under maintenance",
-        "What is the average units produced per equipment?",
-        "Which product codes have the highest defect rates?",
-        "Show production trends by month",
-        "Which operators have the most production runs?",
-        "What is the total output by production line with equipment details?",
-    ],
-    "saas": [
-        "What is the total MRR by subscription plan?",
-        "Which customers have health scores below 50?",
-        "Show the top 10 customers by monthly recurring revenue",
-        "What is the average feature usage by industry?",
-        "Which features are most used across all customers?",
-        "List Enterprise customers with declining usage",
-        "What is the customer count by account manager?",
-        "Show usage trends for the Dashboard feature",
-        "Which customers have the highest session minutes?",
-        "What is the total user count by customer plan?",
-    ],
-    "supply_chain": [
-        "What is the total spend by supplier country?",
-        "Which suppliers have ratings below 4.0?",
-        "Show the top 5 suppliers by total purchase order value",
-        "What is the average lead time by supplier category?",
-        "List purchase orders still in Processing status",
-        "Which items have the highest total order quantities?",
-        "What is the total cost by payment terms?",
-        "Show orders by status with supplier details",
-        "Which suppliers have the most purchase orders?",
-        "What is the monthly procurement spend trend?",
-    ],
-    "real_estate": [
-        "What is the average list price by city?",
-        "Which properties have been on market longest?",
-        "Show total sales volume by property type",
-        "What is the average days on market by city?",
-        "List properties with price above $1 million",
-        "Which agents have the most transactions?",
-        "What is the average sale price vs list price ratio?",
-        "Show the distribution of buyer types",
-        "Which cities have the highest average price per square foot?",
-        "What is the total sales volume by month?",
-    ],
-}
-
 questions_path = os.path.join(config_dir, "sample_questions.txt")
 with open(questions_path, "w", encoding="utf-8") as f:
     f.write(f"Sample Questions for {scenario_def['name']} Scenario\n")
     f.write("="*50 + "\n\n")
-    for q in SAMPLE_QUESTIONS[scenario]:
+    for q in load_template_data("sample_questions.json")[scenario]:
         f.write(f"- {q}\n")
 
 print(f"  [OK] config/sample_questions.txt")
@@ -796,6 +789,16 @@ for pdf_file in pdf_files:
 if not pdf_files:
     print("  (No PDFs generated - install reportlab: pip install reportlab)")
 
+if seed_cache_dir and pdf_files:  # Don't cache output that is missing its PDFs
+    try:
+        # Drop entries from earlier days or generator versions; they are never reused
+        for name in os.listdir(SEED_CACHE_ROOT) if os.path.isdir(SEED_CACHE_ROOT) else []:
+            if not name.endswith(seed_cache_suffix):
+                shutil.rmtree(os.path.join(SEED_CACHE_ROOT, name), ignore_errors=True)
+        shutil.copytree(data_dir, seed_cache_dir, dirs_exist_ok=True)
+    except OSError:
+        pass  # Cache is optional
+
 # ============================================================================
 # Summary
 # ============================================================================
@@ -836,32 +839,9 @@ Next steps:
 # Update .env with data folder path
 # ============================================================================
 
-env_path = os.path.join(script_dir, "..", ".env")
-if os.path.exists(env_path):
-    with open(env_path, "r") as f:
-        env_content = f.read()
-    
-    # Update DATA_FOLDER line
-    lines = env_content.split("\n")
-    updated = False
-    for i, line in enumerate(lines):
-        if line.startswith("DATA_FOLDER="):
-            lines[i] = f"DATA_FOLDER={data_folder_path}"
-            updated = True
-            break
-    
-    if not updated:
-        # Add it if not found
-        lines.append(f"DATA_FOLDER={data_folder_path}")
-    
-    with open(env_path, "w") as f:
-        f.write("\n".join(lines))
-    
-    print(f"Updated .env with DATA_FOLDER={data_folder_path}")
-else:
-    print(f"Note: .env not found. Set DATA_FOLDER={data_folder_path} manually.")
+update_env_data_folder(data_folder_path)
 
-if not FPDF_AVAILABLE:
+if not (REPORTLAB_AVAILABLE or FPDF_AVAILABLE):
     print("""
 To generate PDF files for AI Search:
   pip install fpdf2
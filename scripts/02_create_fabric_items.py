@@ -25,7 +25,10 @@ import sys
 import json
 import time
 import base64
+import itertools
+import gzip
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Load environment from azd + project .env
@@ -34,8 +37,16 @@ load_all_env()
 
 # Azure imports
 from azure.identity import AzureCliCredential
+from token_cache import get_access_token
 import requests
 
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -84,15 +95,21 @@ if not os.path.exists(config_path):
 SOLUTION_NAME = args.solutionname
 FABRIC_API = "https://api.fabric.microsoft.com/v1"
 
-with open(config_path) as f:
-    ontology_config = json.load(f)
+with open(config_path, "rb") as f:
+    ontology_config = orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+tables = ontology_config["tables"]
+table_names = list(tables)
+
+# Ontology entity type names, e.g. order_items -> OrderItems
+entity_names = {t: t.title().replace("_", "") for t in table_names}
 
 print(f"\n{'='*60}")
 print(f"Setting up Fabric for: {SOLUTION_NAME}")
 print(f"{'='*60}")
 print(f"Workspace ID: {WORKSPACE_ID}")
 print(f"Scenario: {ontology_config['name']}")
-print(f"Tables: {', '.join(ontology_config['tables'].keys())}")
+print(f"Tables: {', '.join(table_names)}")
 
 # ============================================================================
 # Authentication
@@ -101,31 +118,76 @@ print(f"Tables: {', '.join(ontology_config['tables'].keys())}")
 credential = AzureCliCredential()
 
 def get_headers():
-    """Get fresh headers with token"""
-    token = credential.get_token("https://api.fabric.microsoft.com/.default").token
+    """Get headers with a (shared, cached) token"""
+    token = get_access_token(credential, "https://api.fabric.microsoft.com/.default")
     return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def make_request(method, url, **kwargs):
+# One pooled session: every call reuses the same keep-alive HTTPS connections
+session = requests.Session()
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
+def json_bytes(obj):
+    """Serialize to UTF-8 JSON bytes (orjson when installed)"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj).encode("utf-8")
+
+# JSON bodies larger than this are gzipped when the caller asks for it
+GZIP_MIN_BYTES = 64 * 1024
+
+def encoding_rejected(response):
+    """True if the service refused a gzip-encoded body (415, or a 400 naming the encoding)"""
+    if response.status_code == 415:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        error = response.json()
+    except ValueError:
+        return "encoding" in response.text.lower()
+    text = f"{error.get('errorCode', '')} {error.get('message', '')}".lower()
+    return "encoding" in text or "gzip" in text
+
+def make_request(method, url, gzip_json=False, headers=None, **kwargs):
     """Make request with retry logic for 429 rate limiting"""
+    if gzip_json and "json" in kwargs:
+        # Serialize once; the body is reused if the gzip attempt falls back
+        body = kwargs["data"] = json_bytes(kwargs.pop("json"))
+        if len(body) > GZIP_MIN_BYTES:
+            response = make_request(method, url,
+                                    data=gzip.compress(body, compresslevel=4),
+                                    headers={"Content-Encoding": "gzip"})
+            # Fall back to a plain body only if the service rejects the encoding;
+            # any other 400 is a real validation error and is returned as is
+            if not encoding_rejected(response):
+                return response
+            print(f"  Compressed request rejected ({response.status_code}), resending uncompressed...")
     max_retries = 5
+    retry_after = 0
     for attempt in range(max_retries):
-        response = requests.request(method, url, headers=get_headers(), **kwargs)
+        response = session.request(method, url, headers={**get_headers(), **(headers or {})}, **kwargs)
         if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", 30))
+            # Honor Retry-After, doubling the wait if we keep getting throttled
+            retry_after = max(int(response.headers.get("Retry-After", 30)), retry_after * 2)
             print(f"  Rate limited. Waiting {retry_after}s...")
             time.sleep(retry_after)
             continue
         return response
     return response
 
+# LRO polling: first check after 0.5s, then doubling up to 15s (or Retry-After)
+LRO_FIRST_DELAY = 0.5
+LRO_MAX_DELAY = 15.0
+
 def wait_for_lro(operation_url, timeout=300):
     """Wait for long-running operation to complete"""
     start = time.time()
+    delay = LRO_FIRST_DELAY
     while time.time() - start < timeout:
+        # Quick operations finish within a poll or two; longer ones back off
+        time.sleep(delay)
         resp = make_request("GET", operation_url)
         if resp.status_code == 200:
             result = resp.json()
@@ -140,27 +202,53 @@ def wait_for_lro(operation_url, timeout=300):
                 return result
             elif status in ["Failed", "failed"]:
                 raise Exception(f"Operation failed: {result}")
-        time.sleep(3)
+        retry_after = float(resp.headers.get("Retry-After", 0))
+        delay = min(LRO_MAX_DELAY, max(retry_after, delay * 2))
     raise TimeoutError("Operation timed out")
 
-def find_item(item_type, display_name):
-    """Find a Fabric item by type and name"""
-    url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/items?type={item_type}"
+def wait_ready(probe, max_wait=60):
+    """Call probe() with backoff until it returns True; False if max_wait passes"""
+    delay = LRO_FIRST_DELAY
+    deadline = time.time() + max_wait
+    while not probe():
+        if time.time() > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(LRO_MAX_DELAY, delay * 2)
+    return True
+
+def _find_by_name(url, display_name):
+    """Return the item listed at url with this display name, or None"""
     resp = make_request("GET", url)
     if resp.status_code == 200:
-        for item in resp.json().get("value", []):
-            if item["displayName"] == display_name:
-                return item
+        return next((item for item in resp.json().get("value", [])
+                     if item["displayName"] == display_name), None)
     return None
 
+def find_item(item_type, display_name):
+    """Find a Fabric item by type and name"""
+    url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/items?type={item_type}"
+    return _find_by_name(url, display_name)
+
 def find_ontology(display_name):
     """Find an ontology by name using the ontologies endpoint"""
     url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/ontologies"
-    resp = make_request("GET", url)
+    return _find_by_name(url, display_name)
+
+def name_in_use(resp):
+    """True if a create call failed because the display name is already taken"""
+    if resp.status_code == 409:
+        return True
+    try:
+        return resp.json().get("errorCode") == "ItemDisplayNameAlreadyInUse"
+    except ValueError:
+        return False
+
+def get_workspace_name():
+    """Get the workspace display name (script 03 needs it for OneLake paths)"""
+    resp = make_request("GET", f"{FABRIC_API}/workspaces/{WORKSPACE_ID}")
     if resp.status_code == 200:
-        for ont in resp.json().get("value", []):
-            if ont["displayName"] == display_name:
-                return ont
+        return resp.json().get("displayName")
     return None
 
 def delete_item(item_type, item_id, item_name):
@@ -187,11 +275,11 @@ def delete_ontology(ontology_id, ontology_name):
 
 def b64encode(content):
     """Encode content to base64"""
-    if isinstance(content, dict):
-        content = json.dumps(content)
-    if isinstance(content, str):
+    if isinstance(content, (dict, list)):
+        content = json_bytes(content)
+    elif isinstance(content, str):
         content = content.encode("utf-8")
-    return base64.b64encode(content).decode("utf-8")
+    return base64.b64encode(content).decode("ascii")
 
 # ============================================================================
 # Step 0: Determine lakehouse/ontology names (use local tracking, minimize API calls)
@@ -227,7 +315,13 @@ ontology_name = f"{SOLUTION_NAME}_ontology_{new_suffix}"
 
 print(f"\n[1/4] Creating Lakehouse...")
 
-existing_lakehouse = find_item("Lakehouse", lakehouse_name)
+# A freshly bumped suffix (--clean) can't match existing items, so skip the lookups.
+# Otherwise the ontology lookup doesn't depend on the Lakehouse; run it in the background
+lookup_pool = ThreadPoolExecutor(max_workers=2)
+workspace_name_future = lookup_pool.submit(get_workspace_name)
+existing_ontology_future = None if args.clean else lookup_pool.submit(find_ontology, ontology_name)
+
+existing_lakehouse = None if args.clean else find_item("Lakehouse", lakehouse_name)
 if existing_lakehouse:
     lakehouse_id = existing_lakehouse["id"]
     print(f"  [OK] Using existing Lakehouse: {lakehouse_name} ({lakehouse_id})")
@@ -245,12 +339,23 @@ else:
         result = wait_for_lro(operation_url)
         lakehouse_id = result.get("id")
         print(f"  [OK] Created Lakehouse: {lakehouse_name} ({lakehouse_id})")
+    elif name_in_use(resp):
+        # fabric_suffix.txt is shared across workspaces/checkouts, so a --clean
+        # suffix may already be taken; reuse that Lakehouse as before
+        existing_lakehouse = find_item("Lakehouse", lakehouse_name)
+        if not existing_lakehouse:
+            print(f"  [FAIL] Lakehouse name in use but not found: {lakehouse_name}")
+            sys.exit(1)
+        lakehouse_id = existing_lakehouse["id"]
+        print(f"  [OK] Using existing Lakehouse: {lakehouse_name} ({lakehouse_id})")
     else:
         print(f"  [FAIL] Failed to create Lakehouse: {resp.status_code} {resp.text}")
         sys.exit(1)
 
 # Wait for Lakehouse to be ready
-time.sleep(5)
+lakehouse_url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/lakehouses/{lakehouse_id}"
+if not wait_ready(lambda: make_request("GET", lakehouse_url).status_code == 200):
+    print("  [WARN] Lakehouse not reachable yet; continuing")
 
 # ============================================================================
 # Step 2: Create Ontology (using dedicated ontologies API)
@@ -258,25 +363,25 @@ time.sleep(5)
 
 print(f"\n[2/4] Creating Ontology...")
 
-existing_ontology = find_ontology(ontology_name)
+existing_ontology = existing_ontology_future.result() if existing_ontology_future else None
+lookup_pool.shutdown()
 if existing_ontology:
     ontology_id = existing_ontology["id"]
     print(f"  [OK] Using existing Ontology: {ontology_name} ({ontology_id})")
 else:
-    # Generate unique IDs for entities, properties, relationships
-    base_ts = int(time.time() * 1000) % 10000000000
+    # Generate unique numeric IDs for entities, properties, relationships from one
+    # counter seeded with the current time in microseconds (no per-table width limits)
+    next_id = itertools.count(int(time.time() * 1e6)).__next__
     entity_ids = {}
     property_ids = {}
     databinding_ids = {}
     
-    for i, (table_name, table_def) in enumerate(ontology_config["tables"].items()):
-        entity_id = str(base_ts + i * 1000)
+    for table_name, table_def in tables.items():
+        entity_id = str(next_id())
         entity_ids[table_name] = entity_id
         databinding_ids[table_name] = str(uuid.uuid4())
         
-        property_ids[table_name] = {}
-        for j, col in enumerate(table_def["columns"]):
-            property_ids[table_name][col] = str(base_ts + 100000000 + i * 1000 + j)
+        property_ids[table_name] = {col: str(next_id()) for col in table_def["columns"]}
     
     # Build platform metadata
     platform_metadata = {
@@ -313,23 +418,26 @@ else:
     }
     
     # Add EntityTypes and DataBindings for each table
-    for table_name, table_def in ontology_config["tables"].items():
+    for table_name, table_def in tables.items():
+        # Resolve the per-table lookups once for the column loops below
         entity_id = entity_ids[table_name]
-        entity_name = table_name.title().replace("_", "")
-        key_col = table_def["key"]
-        key_prop_id = property_ids[table_name][key_col]
+        entity_name = entity_names[table_name]
+        columns = table_def["columns"]
+        types = table_def["types"]
+        props = property_ids[table_name]
+        key_prop_id = props[table_def["key"]]
         
         # Build properties
-        properties = []
-        for col in table_def["columns"]:
-            col_type = table_def["types"].get(col, "String")
-            properties.append({
-                "id": property_ids[table_name][col],
+        properties = [
+            {
+                "id": props[col],
                 "name": col,
                 "redefines": None,
                 "baseTypeNamespaceType": None,
-                "valueType": type_map.get(col_type, "String")
-            })
+                "valueType": type_map.get(types.get(col, "String"), "String")
+            }
+            for col in columns
+        ]
         
         # Entity Type definition
         entity_type = {
@@ -352,12 +460,10 @@ else:
         })
         
         # Data Binding - use dataBindingConfiguration structure
-        property_bindings = []
-        for col in table_def["columns"]:
-            property_bindings.append({
-                "sourceColumnName": col,
-                "targetPropertyId": property_ids[table_name][col]
-            })
+        property_bindings = [
+            {"sourceColumnName": col, "targetPropertyId": props[col]}
+            for col in columns
+        ]
         
         data_binding = {
             "id": databinding_ids[table_name],
@@ -382,12 +488,12 @@ else:
         print(f"  + Entity: {entity_name} ({len(properties)} properties)")
     
     # Add Relationships
-    for i, rel in enumerate(ontology_config.get("relationships", [])):
+    for rel in ontology_config.get("relationships", []):
         from_table = rel["from"]
         to_table = rel["to"]
         from_entity_id = entity_ids[from_table]
         to_entity_id = entity_ids[to_table]
-        rel_id = str(base_ts + 900000 + i)
+        rel_id = str(next_id())
         contextualization_id = str(uuid.uuid4())
         
         # Relationship Type
@@ -413,11 +519,11 @@ else:
         #   - sourceKeyRefBindings = maps FK column to source entity's PK property
         #   - targetKeyRefBindings = maps target's PK column to target entity's PK property
         
-        from_key = ontology_config["tables"][from_table]["key"]  # PK of source entity (e.g., drivers.id)
+        from_key = tables[from_table]["key"]  # PK of source entity (e.g., drivers.id)
         from_key_prop_id = property_ids[from_table][from_key]
         
         to_key_col = rel["toKey"]  # FK column in target table (e.g., orders.driver_id)
-        to_table_pk = ontology_config["tables"][to_table]["key"]  # PK of target entity (e.g., orders.id)
+        to_table_pk = tables[to_table]["key"]  # PK of target entity (e.g., orders.id)
         to_key_prop_id = property_ids[to_table][to_table_pk]
         
         contextualization = {
@@ -454,7 +560,7 @@ else:
     }
     
     url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/ontologies"
-    resp = make_request("POST", url, json=ontology_payload)
+    resp = make_request("POST", url, json=ontology_payload, gzip_json=True)
     
     if resp.status_code == 201:
         ontology_id = resp.json()["id"]
@@ -468,13 +574,24 @@ else:
             created_ont = find_ontology(ontology_name)
             ontology_id = created_ont["id"] if created_ont else None
         print(f"  [OK] Created Ontology: {ontology_name} ({ontology_id})")
+    elif name_in_use(resp):
+        # Same as the Lakehouse: a --clean suffix can collide with an existing ontology
+        existing_ontology = find_ontology(ontology_name)
+        if not existing_ontology:
+            print(f"  [FAIL] Ontology name in use but not found: {ontology_name}")
+            sys.exit(1)
+        ontology_id = existing_ontology["id"]
+        print(f"  [OK] Using existing Ontology: {ontology_name} ({ontology_id})")
     else:
         print(f"  [FAIL] Failed to create Ontology: {resp.status_code}")
         print(f"    Response: {resp.text}")
         sys.exit(1)
 
 # Wait for Ontology to be ready
-time.sleep(3)
+if ontology_id:
+    ontology_url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/ontologies/{ontology_id}"
+    if not wait_ready(lambda: make_request("GET", ontology_url).status_code == 200):
+        print("  [WARN] Ontology not reachable yet; continuing")
 
 # ============================================================================
 # Step 3: Save IDs for later scripts
@@ -489,10 +606,11 @@ fabric_ids = {
     "ontology_id": ontology_id,
     "ontology_name": ontology_name,
     "solution_name": SOLUTION_NAME,
+    "workspace_name": workspace_name_future.result(),
     "created_at": datetime.now().isoformat()
 }
 with open(ids_path, "w") as f:
-    json.dump(fabric_ids, f, indent=2)
+    f.write(json.dumps(fabric_ids, indent=2))
 print(f"  [OK] Saved fabric_ids.json")
 
 # ============================================================================
@@ -508,7 +626,7 @@ Lakehouse: {lakehouse_name}
   
 Ontology: {ontology_name}
   ID: {ontology_id}
-  Entities: {', '.join([t.title().replace('_', '') for t in ontology_config['tables'].keys()])}
+  Entities: {', '.join(entity_names.values())}
 
 IDs saved to: {ids_path}
 
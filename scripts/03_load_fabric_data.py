@@ -3,7 +3,7 @@
 Uploads CSV files to Lakehouse and loads them as Delta tables.
 
 Usage:
-    python 03_load_fabric_data.py [--data-folder <PATH>]
+    python 03_load_fabric_data.py [--data-folder <PATH>] [--parquet]
 
 Prerequisites:
     - Run 01_generate_sample_data.py (sets DATA_FOLDER in .env)
@@ -12,8 +12,8 @@ Prerequisites:
 
 What this script does:
     1. Reads fabric_ids.json from data folder
-    2. Uploads CSV files to Lakehouse Files folder
-    3. Loads CSV files as Delta tables using Fabric API
+    2. Uploads table files to Lakehouse Files folder (typed Parquet if current, else CSV)
+    3. Loads them as Delta tables using Fabric API
 """
 
 import argparse
@@ -21,6 +21,7 @@ import os
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment from azd + project .env
 from load_env import load_all_env
@@ -28,9 +29,26 @@ load_all_env()
 
 # Azure imports
 from azure.identity import AzureCliCredential
+from token_cache import CachedTokenCredential, get_access_token
 from azure.storage.filedatalake import DataLakeServiceClient
 import requests
 
+# Faster JSON parsing when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Local CSV -> Parquet conversion for --parquet (optional)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -40,8 +58,13 @@ p.add_argument("--data-folder", default=os.getenv("DATA_FOLDER"),
                help="Path to data folder (default: from .env)")
 p.add_argument("--skip-tables", action="store_true",
                help="Skip loading to Delta tables (upload files only)")
+p.add_argument("--parquet", action="store_true",
+               help="Convert CSV tables to Parquet before upload (requires pyarrow)")
 args = p.parse_args()
 
+if args.parquet and not PYARROW_AVAILABLE:
+    print("  Note: pyarrow not installed, --parquet ignored (pip install pyarrow)")
+
 # Validate data folder
 data_dir = args.data_folder
 if not data_dir:
@@ -76,11 +99,14 @@ if not os.path.exists(fabric_ids_path):
     print("       Run 02_create_fabric_items.py first")
     sys.exit(1)
 
-with open(config_path) as f:
-    ontology_config = json.load(f)
+def load_json(path):
+    """Read a JSON file (orjson when installed)"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
 
-with open(fabric_ids_path) as f:
-    fabric_ids = json.load(f)
+ontology_config = load_json(config_path)
+fabric_ids = load_json(fabric_ids_path)
+table_names = list(ontology_config["tables"])
 
 # Get workspace_id from environment (not config file for security)
 WORKSPACE_ID = os.getenv("FABRIC_WORKSPACE_ID")
@@ -99,7 +125,7 @@ print(f"{'='*60}")
 print(f"Data folder: {data_dir}")
 print(f"Workspace: {WORKSPACE_ID}")
 print(f"Lakehouse: {LAKEHOUSE_NAME}")
-print(f"Tables: {', '.join(ontology_config['tables'].keys())}")
+print(f"Tables: {', '.join(table_names)}")
 
 # ============================================================================
 # Authentication
@@ -107,28 +133,41 @@ print(f"Tables: {', '.join(ontology_config['tables'].keys())}")
 
 credential = AzureCliCredential()
 
+# One pooled session shared by all calls (and the parallel table loads below)
+session = requests.Session()
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
 def get_headers():
-    """Get fresh headers with token"""
-    token = credential.get_token("https://api.fabric.microsoft.com/.default").token
+    """Get headers with a (shared, cached) token"""
+    token = get_access_token(credential, "https://api.fabric.microsoft.com/.default")
     return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
 def make_request(method, url, **kwargs):
     """Make request with retry logic for 429 rate limiting"""
     max_retries = 5
+    retry_after = 0
     for attempt in range(max_retries):
-        response = requests.request(method, url, headers=get_headers(), **kwargs)
+        response = session.request(method, url, headers=get_headers(), **kwargs)
         if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", 30))
+            # Honor Retry-After, doubling the wait if we keep getting throttled
+            retry_after = max(int(response.headers.get("Retry-After", 30)), retry_after * 2)
             print(f"    Rate limited. Waiting {retry_after}s...")
             time.sleep(retry_after)
             continue
         return response
     return response
 
+# LRO polling: first check after 0.5s, then doubling up to 15s (or Retry-After)
+LRO_FIRST_DELAY = 0.5
+LRO_MAX_DELAY = 15.0
+
 def wait_for_lro(operation_url, operation_name="Operation", timeout=300):
     """Wait for long-running operation to complete"""
     start = time.time()
+    delay = LRO_FIRST_DELAY
     while time.time() - start < timeout:
+        # Quick operations finish within a poll or two; longer ones back off
+        time.sleep(delay)
         resp = make_request("GET", operation_url)
         if resp.status_code == 200:
             result = resp.json()
@@ -139,20 +178,38 @@ def wait_for_lro(operation_url, operation_name="Operation", timeout=300):
             elif status in ["Failed", "failed"]:
                 print(f"    [FAIL] {operation_name} failed: {result}")
                 return None
-        time.sleep(3)
+        retry_after = float(resp.headers.get("Retry-After", 0))
+        delay = min(LRO_MAX_DELAY, max(retry_after, delay * 2))
     print(f"    [FAIL] {operation_name} timed out")
     return None
 
+def wait_ready(probe, max_wait=60):
+    """Call probe() with backoff until it returns True; False if max_wait passes"""
+    delay = LRO_FIRST_DELAY
+    deadline = time.time() + max_wait
+    while not probe():
+        if time.time() > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(LRO_MAX_DELAY, delay * 2)
+    return True
+
 # ============================================================================
 # Step 1: Get Workspace Name (needed for OneLake path)
 # ============================================================================
 
 print(f"\n[1/3] Getting workspace info...")
-resp = make_request("GET", f"{FABRIC_API}/workspaces/{WORKSPACE_ID}")
-if resp.status_code != 200:
-    print(f"  [FAIL] Failed to get workspace info: {resp.text}")
-    sys.exit(1)
-workspace_name = resp.json()["displayName"]
+# Script 02 saves the name; only older fabric_ids.json files need the lookup
+workspace_name = fabric_ids.get("workspace_name")
+if not workspace_name:
+    resp = make_request("GET", f"{FABRIC_API}/workspaces/{WORKSPACE_ID}")
+    if resp.status_code != 200:
+        print(f"  [FAIL] Failed to get workspace info: {resp.text}")
+        sys.exit(1)
+    workspace_name = resp.json()["displayName"]
+    fabric_ids["workspace_name"] = workspace_name
+    with open(fabric_ids_path, "w") as f:
+        f.write(json.dumps(fabric_ids, indent=2))
 print(f"  Workspace name: {workspace_name}")
 
 # ============================================================================
@@ -163,38 +220,123 @@ print(f"\n[2/3] Uploading CSV files to Lakehouse...")
 
 # Setup OneLake connection (use workspace NAME, not ID)
 account_url = f"https://{ONELAKE_URL}"
-service_client = DataLakeServiceClient(account_url, credential=credential)
+service_client = DataLakeServiceClient(account_url, credential=CachedTokenCredential(credential))
 file_system_client = service_client.get_file_system_client(workspace_name)
 
 # Get directory client for Lakehouse Files folder
 data_path = f"{LAKEHOUSE_NAME}.Lakehouse/Files"
 directory_client = file_system_client.get_directory_client(data_path)
 
-uploaded_files = []
-for table_name in ontology_config["tables"].keys():
-    csv_file = f"{table_name}.csv"
-    csv_path = os.path.join(tables_dir, csv_file)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# List the tables folder once instead of stat-ing each candidate file
+try:
+    with os.scandir(tables_dir) as entries:
+        local_sizes = {e.name: e.stat().st_size for e in entries if e.is_file()}
+except FileNotFoundError:
+    local_sizes = {}
+
+def parquet_column_types(table_name):
+    """Arrow type per column from the ontology config, so pyarrow never guesses.
+    
+    02 binds columns by these types; anything not numeric/boolean (dates
+    included) stays a string exactly as written in the CSV.
+    """
+    arrow_types = {"BigInt": pa.int64(), "Double": pa.float64(), "Boolean": pa.bool_()}
+    table = ontology_config["tables"][table_name]
+    types = table.get("types", {})
+    return {col: arrow_types.get(types.get(col, "String"), pa.string())
+            for col in table.get("columns", types)}
+
+def convert_to_parquet(table_name):
+    """Write <table>.parquet next to <table>.csv; returns the Parquet size"""
+    csv_path = os.path.join(tables_dir, f"{table_name}.csv")
+    parquet_path = os.path.join(tables_dir, f"{table_name}.parquet")
+    convert_options = pacsv.ConvertOptions(column_types=parquet_column_types(table_name))
+    pq.write_table(pacsv.read_csv(csv_path, convert_options=convert_options),
+                   parquet_path, compression="zstd")
+    return os.path.getsize(parquet_path)
+
+def parquet_is_current(table_name):
+    """True when an existing <table>.parquet matches its CSV and the ontology types.
+    
+    A Parquet written by the generator gets pandas' inferred types, and one
+    older than its CSV misses later edits; either is rebuilt from the CSV.
+    """
+    csv_path = os.path.join(tables_dir, f"{table_name}.csv")
+    parquet_path = os.path.join(tables_dir, f"{table_name}.parquet")
+    if os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        return False
+    expected = parquet_column_types(table_name)
+    schema = pq.read_schema(parquet_path)
+    return schema.names == list(expected) and all(
+        schema.field(col).type == arrow_type for col, arrow_type in expected.items())
+
+def upload_table_file(table_name):
+    """Upload one table's file; returns (table_name, data_file, size, error)"""
+    # Parquet is smaller and keeps column types. An existing one is only used
+    # when pyarrow can confirm it is current; otherwise it is rebuilt (or, with
+    # no pyarrow, the CSV is uploaded instead).
+    data_file = f"{table_name}.parquet"
+    if f"{table_name}.csv" in local_sizes:
+        rebuild = args.parquet and data_file not in local_sizes
+        try:
+            if data_file in local_sizes and not (PYARROW_AVAILABLE and parquet_is_current(table_name)):
+                del local_sizes[data_file]
+                rebuild = True
+            if rebuild and PYARROW_AVAILABLE:
+                local_sizes[data_file] = convert_to_parquet(table_name)
+        except Exception as e:
+            local_sizes.pop(data_file, None)
+            print(f"  [WARN] Parquet conversion failed for {table_name}, uploading CSV: {e}")
+    if data_file not in local_sizes:
+        data_file = f"{table_name}.csv"
+    data_path_local = os.path.join(tables_dir, data_file)
     
-    if not os.path.exists(csv_path):
-        print(f"  [FAIL] CSV not found: {csv_file}")
-        continue
+    if data_file not in local_sizes:
+        return table_name, data_file, None, "not found"
     
     try:
-        print(f"  Uploading {csv_file}...")
-        file_client = directory_client.get_file_client(csv_file)
-        with open(csv_path, "rb") as f:
-            file_client.upload_data(f, overwrite=True)
-        
-        file_size = os.path.getsize(csv_path)
-        print(f"  [OK] {csv_file} uploaded ({file_size:,} bytes)")
-        uploaded_files.append(csv_file)
+        file_size = local_sizes[data_file]
+        file_client = directory_client.get_file_client(data_file)
+        with open(data_path_local, "rb") as f:
+            # Large files go up as 8 MiB chunks, 4 at a time
+            file_client.upload_data(f, length=file_size, overwrite=True,
+                                    chunk_size=UPLOAD_CHUNK_SIZE, max_concurrency=4)
+        return table_name, data_file, file_size, None
     except Exception as e:
-        print(f"  [FAIL] Failed to upload {csv_file}: {e}")
+        return table_name, data_file, None, e
+
+uploaded_files = []
+table_files = {}  # table name -> uploaded file name (parquet preferred over CSV)
+print(f"  Uploading {len(table_names)} files in parallel...")
+with ThreadPoolExecutor(max_workers=min(8, len(table_names) or 1)) as pool:
+    results = list(pool.map(upload_table_file, table_names))
+
+for table_name, data_file, file_size, error in results:
+    if error == "not found":
+        print(f"  [FAIL] CSV not found: {data_file}")
+    elif error:
+        print(f"  [FAIL] Failed to upload {data_file}: {error}")
         sys.exit(1)
+    else:
+        print(f"  [OK] {data_file} uploaded ({file_size:,} bytes)")
+        uploaded_files.append(data_file)
+        table_files[table_name] = data_file
 
-# Wait for files to be available in OneLake
+# Wait for files to be visible in OneLake (usually immediate) instead of a fixed sleep
 print("  Waiting for files to be available...")
-time.sleep(10)
+def file_visible(data_file):
+    """True once OneLake serves the uploaded file's properties"""
+    try:
+        directory_client.get_file_client(data_file).get_file_properties()
+        return True
+    except Exception:
+        return False
+
+for data_file in uploaded_files:
+    if not wait_ready(lambda: file_visible(data_file), max_wait=30):
+        print(f"  [WARN] {data_file} not visible yet; continuing")
 
 # ============================================================================
 # Step 3: Load CSV Files as Delta Tables
@@ -207,20 +349,26 @@ else:
     
     tables_url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/lakehouses/{LAKEHOUSE_ID}/tables"
     
-    for table_name in ontology_config["tables"].keys():
-        csv_file = f"{table_name}.csv"
-        print(f"  Loading {csv_file} as table '{table_name}'...")
+    def load_table(table_name):
+        """Start a Delta table load and wait for it (tables load independently)"""
+        data_file = table_files.get(table_name, f"{table_name}.csv")
+        print(f"  Loading {data_file} as table '{table_name}'...")
         
-        load_table_url = f"{tables_url}/{table_name}/load"
-        load_payload = {
-            "relativePath": f"Files/{csv_file}",
-            "pathType": "File",
-            "mode": "Overwrite",
-            "formatOptions": {
+        if data_file.endswith(".parquet"):
+            format_options = {"format": "Parquet"}
+        else:
+            format_options = {
                 "format": "Csv",
                 "header": True,
                 "delimiter": ","
             }
+        
+        load_table_url = f"{tables_url}/{table_name}/load"
+        load_payload = {
+            "relativePath": f"Files/{data_file}",
+            "pathType": "File",
+            "mode": "Overwrite",
+            "formatOptions": format_options
         }
         
         resp = make_request("POST", load_table_url, json=load_payload)
@@ -234,9 +382,26 @@ else:
             print(f"  ⚠ Table loading returned status: {resp.status_code}")
             print(f"    Response: {resp.text}")
     
-    # Wait for tables to be indexed
+    # Run loads concurrently (4 at a time to stay clear of throttling);
+    # wall time is roughly the slowest table, not the sum
+    with ThreadPoolExecutor(max_workers=min(4, len(table_names) or 1)) as pool:
+        list(pool.map(load_table, table_names))
+    
+    # Wait until every table shows up in the Lakehouse table list instead of a fixed sleep
     print("  Waiting for tables to be indexed...")
-    time.sleep(30)
+    pending = set(table_names)
+    
+    def tables_listed():
+        """Drop listed tables from pending; True once none are left"""
+        resp = make_request("GET", tables_url)
+        if resp.status_code == 200:
+            pending.difference_update(t.get("name") for t in resp.json().get("data", []))
+        return not pending
+    
+    if wait_ready(tables_listed):
+        print("  [OK] All tables available")
+    else:
+        print(f"  [WARN] Tables not listed yet: {', '.join(sorted(pending))}; continuing")
 
 # ============================================================================
 # Summary
@@ -247,7 +412,7 @@ print("Data Load Complete!")
 print(f"{'='*60}")
 print(f"""
 Uploaded {len(uploaded_files)} files: {', '.join(uploaded_files)}
-Tables loaded: {', '.join(ontology_config['tables'].keys())}
+Tables loaded: {', '.join(table_names)}
 
 Next step - Generate schema prompt:
   python scripts/04_generate_agent_prompt.py
@@ -18,6 +18,13 @@ import os
 import sys
 import json
 
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment from azd + project .env
 from load_env import load_all_env
 load_all_env()
@@ -33,6 +40,17 @@ p.add_argument("--data-folder", default=os.getenv("DATA_FOLDER"),
                help="Path to data folder (default: from .env)")
 args = p.parse_args()
 
+def load_json(path):
+    """Read a JSON file (orjson when installed)"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+def dump_json(data):
+    """Serialize to indented UTF-8 JSON bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
 # Default to config if neither specified
 if not args.from_fabric:
     args.from_config = True
@@ -58,6 +76,24 @@ print(f"{'='*60}")
 # Load Schema
 # ============================================================================
 
+def schema_from_config(config):
+    """Convert ontology_config.json contents to schema format"""
+    return {
+        "name": config["name"],
+        "description": config["description"],
+        "tables": {
+            table_name: {
+                "columns": [
+                    {"name": col, "type": table_def["types"].get(col, "String")}
+                    for col in table_def["columns"]
+                ],
+                "key": table_def["key"]
+            }
+            for table_name, table_def in config["tables"].items()
+        },
+        "relationships": config.get("relationships", [])
+    }
+
 schema_data = None
 
 if args.from_config:
@@ -69,25 +105,7 @@ if args.from_config:
         print("       Run 01_generate_sample_data.py first")
         sys.exit(1)
     
-    with open(config_path) as f:
-        config = json.load(f)
-    
-    # Convert config to schema format
-    schema_data = {
-        "name": config["name"],
-        "description": config["description"],
-        "tables": {},
-        "relationships": config.get("relationships", [])
-    }
-    
-    for table_name, table_def in config["tables"].items():
-        schema_data["tables"][table_name] = {
-            "columns": [
-                {"name": col, "type": table_def["types"].get(col, "String")}
-                for col in table_def["columns"]
-            ],
-            "key": table_def["key"]
-        }
+    schema_data = schema_from_config(load_json(config_path))
 
 elif args.from_fabric:
     print("\nSource: Fabric Ontology API")
@@ -99,12 +117,14 @@ elif args.from_fabric:
         print("       Run 02_create_fabric_items.py first")
         sys.exit(1)
     
-    with open(ids_path) as f:
-        fabric_ids = json.load(f)
+    fabric_ids = load_json(ids_path)
     
     # Fetch from Fabric API
     from azure.identity import AzureCliCredential
+    from token_cache import get_access_token
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     import time
     import base64
     
@@ -113,27 +133,41 @@ elif args.from_fabric:
     FABRIC_API = "https://api.fabric.microsoft.com/v1"
     
     credential = AzureCliCredential()
-    token = credential.get_token("https://api.fabric.microsoft.com/.default").token
+    token = get_access_token(credential, "https://api.fabric.microsoft.com/.default")
     headers = {"Authorization": f"Bearer {token}"}
     
+    # One keep-alive session for the request and its polls. The adapter retries
+    # throttling and transient gateway errors with backoff, but only for GETs:
+    # retrying the getDefinition POST could start the operation twice. When
+    # retries run out the last response is returned, so the status checks
+    # below report it instead of a RetryError traceback.
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(
+        total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503],
+        allowed_methods=frozenset({"GET"}), raise_on_status=False)))
+    
     # Use POST to getDefinition (async operation)
     url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/ontologies/{ONTOLOGY_ID}/getDefinition"
-    resp = requests.post(url, headers=headers)
+    resp = session.post(url, headers=headers)
     
     # Handle async operation (202)
     if resp.status_code == 202:
-        location = resp.headers.get("Location")
-        retry_after = int(resp.headers.get("Retry-After", 2))
+        # Poll the lightweight operation-status URL; fetch the definition once at the end
+        location = resp.headers.get("Azure-AsyncOperation") or resp.headers.get("Location")
         print(f"  Waiting for async operation...")
         
-        for attempt in range(15):
-            time.sleep(retry_after)
-            poll_resp = requests.get(location, headers=headers)
+        # Poll after 0.5s, then back off 1.5x up to 8s, honoring each Retry-After
+        delay = 0.5
+        deadline = time.time() + 120
+        while time.time() < deadline:
+            time.sleep(delay)
+            poll_resp = session.get(location, headers=headers)
             
             if poll_resp.status_code == 200:
                 poll_data = poll_resp.json()
                 if poll_data.get("status") == "Succeeded":
-                    resp = poll_resp
+                    result_url = poll_resp.headers.get("Location") or f"{location}/result"
+                    resp = session.get(result_url, headers=headers)
                     break
                 elif poll_data.get("status") == "Failed":
                     print(f"ERROR: Operation failed: {poll_data}")
@@ -141,6 +175,8 @@ elif args.from_fabric:
             elif poll_resp.status_code != 202:
                 print(f"ERROR: Poll failed: {poll_resp.status_code} {poll_resp.text}")
                 sys.exit(1)
+            retry_after = float(poll_resp.headers.get("Retry-After", 0))
+            delay = min(8, max(retry_after, delay * 1.5))
     
     # Parse definition parts
     parts = []
@@ -153,24 +189,7 @@ elif args.from_fabric:
         print("  Note: Ontology API didn't return definition parts, using local config")
         config_path = os.path.join(data_dir, "ontology_config.json")
         if os.path.exists(config_path):
-            with open(config_path) as f:
-                config = json.load(f)
-            
-            schema_data = {
-                "name": config["name"],
-                "description": config["description"],
-                "tables": {},
-                "relationships": config.get("relationships", [])
-            }
-            
-            for table_name, table_def in config["tables"].items():
-                schema_data["tables"][table_name] = {
-                    "columns": [
-                        {"name": col, "type": table_def["types"].get(col, "String")}
-                        for col in table_def["columns"]
-                    ],
-                    "key": table_def["key"]
-                }
+            schema_data = schema_from_config(load_json(config_path))
         else:
             print(f"ERROR: No ontology_config.json found")
             sys.exit(1)
@@ -180,10 +199,13 @@ elif args.from_fabric:
         
         for part in parts:
             path = part.get("path", "")
-            payload = base64.b64decode(part.get("payload", "")).decode("utf-8")
+            # Only entity/relationship definitions are used; skip decoding the rest
+            if "/definition.json" not in path or not ("EntityTypes/" in path or "RelationshipTypes/" in path):
+                continue
+            payload = base64.b64decode(part.get("payload", ""))
             
             try:
-                content = json.loads(payload)
+                content = orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
             except:
                 continue
             
@@ -222,6 +244,15 @@ elif args.from_fabric:
 # Generate Optimized Prompt
 # ============================================================================
 
+# Short type names used in the prompt (others: first 3 letters, lowercased)
+TYPE_ABBREV = {
+    "String": "str",
+    "BigInt": "int",
+    "Double": "num",
+    "Boolean": "bool",
+    "DateTime": "date"
+}
+
 def build_optimized_prompt(schema):
     """Build token-efficient schema prompt"""
     lines = []
@@ -230,20 +261,13 @@ def build_optimized_prompt(schema):
     
     # Tables and columns in compact format
     for table_name, table_def in schema["tables"].items():
-        cols = []
-        for col in table_def["columns"]:
-            type_abbrev = {
-                "String": "str",
-                "BigInt": "int", 
-                "Double": "num",
-                "Boolean": "bool",
-                "DateTime": "date"
-            }.get(col["type"], col["type"][:3].lower())
-            
-            key_marker = "*" if col["name"] == table_def.get("key") else ""
-            cols.append(f"{col['name']}{key_marker}:{type_abbrev}")
-        
-        lines.append(f"{table_name}({', '.join(cols)})")
+        key = table_def.get("key")
+        cols = ", ".join([
+            f"{col['name']}{'*' if col['name'] == key else ''}:"
+            f"{TYPE_ABBREV.get(col['type']) or col['type'][:3].lower()}"
+            for col in table_def["columns"]
+        ])
+        lines.append(f"{table_name}({cols})")
     
     # Relationships
     if schema.get("relationships"):
@@ -265,13 +289,14 @@ prompt_text = build_optimized_prompt(schema_data)
 
 # Save prompt
 prompt_path = os.path.join(config_dir, "schema_prompt.txt")
-with open(prompt_path, "w") as f:
-    f.write(prompt_text)
+# Each file is serialized up front and written with one call
+with open(prompt_path, "wb", buffering=1 << 20) as f:
+    f.write(prompt_text.encode("utf-8"))
 
 # Also save full schema as JSON for reference
 schema_path = os.path.join(config_dir, "schema.json")
-with open(schema_path, "w") as f:
-    json.dump(schema_data, f, indent=2)
+with open(schema_path, "wb", buffering=1 << 20) as f:
+    f.write(dump_json(schema_data))
 
 # ============================================================================
 # Summary
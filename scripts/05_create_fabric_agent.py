@@ -15,11 +15,19 @@ What this script does:
 """
 
 import os
+import re
 import sys
 import json
 import time
 import base64
 
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Get script directory for relative paths
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -28,6 +36,7 @@ from load_env import load_all_env
 load_all_env()
 
 from azure.identity import AzureCliCredential
+from token_cache import get_access_token
 import requests
 
 # ============================================================================
@@ -49,20 +58,40 @@ if not DATA_FOLDER:
 
 data_dir = os.path.abspath(DATA_FOLDER)
 
-# Set up paths for new folder structure
+# Set up paths for new folder structure; one listing answers the file checks below
+def list_files(folder):
+    """Names of the files in folder, or None if the folder doesn't exist"""
+    try:
+        with os.scandir(folder) as entries:
+            return {e.name for e in entries if e.is_file()}
+    except FileNotFoundError:
+        return None
+
 config_dir = os.path.join(data_dir, "config")
-if not os.path.exists(config_dir):
+config_files = list_files(config_dir)
+if config_files is None:
     config_dir = data_dir  # Fallback to old structure
+    config_files = list_files(config_dir) or set()
+
+def load_json(path):
+    """Read a JSON file (orjson when installed)"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+def dump_json(data):
+    """Serialize to indented UTF-8 JSON bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
 
 # Load fabric_ids.json
 fabric_ids_path = os.path.join(config_dir, "fabric_ids.json")
-if not os.path.exists(fabric_ids_path):
+if "fabric_ids.json" not in config_files:
     print(f"ERROR: fabric_ids.json not found")
     print("       Run 02_create_fabric_items.py first")
     sys.exit(1)
 
-with open(fabric_ids_path) as f:
-    fabric_ids = json.load(f)
+fabric_ids = load_json(fabric_ids_path)
 
 ONTOLOGY_ID = fabric_ids["ontology_id"]
 SOLUTION_NAME = fabric_ids["solution_name"]
@@ -83,28 +112,41 @@ print(f"Data Agent Name: {DATA_AGENT_NAME}")
 
 credential = AzureCliCredential()
 
+# One pooled session: every call reuses the same keep-alive HTTPS connections
+session = requests.Session()
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
 def get_headers():
-    """Get fresh headers with token"""
-    token = credential.get_token("https://api.fabric.microsoft.com/.default").token
+    """Get headers with a (shared, cached) token"""
+    token = get_access_token(credential, "https://api.fabric.microsoft.com/.default")
     return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
 def make_request(method, url, **kwargs):
     """Make request with retry logic for 429 rate limiting"""
     max_retries = 5
+    retry_after = 0
     for attempt in range(max_retries):
-        response = requests.request(method, url, headers=get_headers(), **kwargs)
+        response = session.request(method, url, headers=get_headers(), **kwargs)
         if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", 30))
+            # Honor Retry-After, doubling the wait if we keep getting throttled
+            retry_after = max(int(response.headers.get("Retry-After", 30)), retry_after * 2)
             print(f"  Rate limited. Waiting {retry_after}s...")
             time.sleep(retry_after)
             continue
         return response
     return response
 
+# LRO polling: first check after 0.5s, then doubling up to 15s (or Retry-After)
+LRO_FIRST_DELAY = 0.5
+LRO_MAX_DELAY = 15.0
+
 def wait_for_lro(operation_url, operation_name="Operation", timeout=300):
     """Wait for long-running operation to complete"""
     start = time.time()
+    delay = LRO_FIRST_DELAY
     while time.time() - start < timeout:
+        # Quick operations finish within a poll or two; longer ones back off
+        time.sleep(delay)
         resp = make_request("GET", operation_url)
         if resp.status_code == 200:
             result = resp.json()
@@ -115,15 +157,18 @@ def wait_for_lro(operation_url, operation_name="Operation", timeout=300):
             elif status in ["Failed", "failed"]:
                 print(f"  [FAIL] {operation_name} failed: {result}")
                 return None
-        time.sleep(3)
+        retry_after = float(resp.headers.get("Retry-After", 0))
+        delay = min(LRO_MAX_DELAY, max(retry_after, delay * 2))
     print(f"  [FAIL] {operation_name} timed out")
     return None
 
 def encode_to_base64(data):
     """Encode data to base64 string"""
     if isinstance(data, dict):
-        data = json.dumps(data)
-    return base64.b64encode(data.encode('utf-8')).decode('utf-8')
+        data = orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode('utf-8')
+    elif isinstance(data, str):
+        data = data.encode('utf-8')
+    return base64.b64encode(data).decode('ascii')
 
 # ============================================================================
 # Load Schema and Ontology Config for Instructions
@@ -131,9 +176,8 @@ def encode_to_base64(data):
 
 # Load ontology config for scenario-specific instructions
 config_path = os.path.join(config_dir, "ontology_config.json")
-if os.path.exists(config_path):
-    with open(config_path) as f:
-        ontology_config = json.load(f)
+if "ontology_config.json" in config_files:
+    ontology_config = load_json(config_path)
     scenario_name = ontology_config.get("name", "Business Data")
     scenario_desc = ontology_config.get("description", "")
     tables = list(ontology_config.get("tables", {}).keys())
@@ -145,7 +189,7 @@ else:
     tables = []
 
 prompt_path = os.path.join(config_dir, "schema_prompt.txt")
-if os.path.exists(prompt_path):
+if "schema_prompt.txt" in config_files:
     with open(prompt_path) as f:
         schema_prompt = f.read()
     print(f"Loaded schema prompt ({len(schema_prompt)} chars)")
@@ -205,10 +249,8 @@ url = f"{FABRIC_API}/workspaces/{WORKSPACE_ID}/items?type=DataAgent"
 resp = make_request("GET", url)
 existing_agent = None
 if resp.status_code == 200:
-    for item in resp.json().get("value", []):
-        if item["displayName"] == DATA_AGENT_NAME:
-            existing_agent = item
-            break
+    existing_agent = next(
+        (item for item in resp.json().get("value", []) if item["displayName"] == DATA_AGENT_NAME), None)
 
 data_agent_id = None
 final_agent_name = DATA_AGENT_NAME
@@ -321,8 +363,8 @@ else:
 
 fabric_ids["data_agent_id"] = data_agent_id
 fabric_ids["data_agent_name"] = final_agent_name
-with open(fabric_ids_path, "w") as f:
-    json.dump(fabric_ids, f, indent=2)
+with open(fabric_ids_path, "wb", buffering=1 << 20) as f:
+    f.write(dump_json(fabric_ids))
 
 # Update .env with FABRIC_AGENT_ID
 env_path = os.path.join(script_dir, "..", ".env")
@@ -330,17 +372,14 @@ if os.path.exists(env_path):
     with open(env_path, "r") as f:
         env_content = f.read()
     
-    lines = env_content.split("\n")
-    updated = False
-    for i, line in enumerate(lines):
-        if line.startswith("FABRIC_AGENT_ID="):
-            lines[i] = f"FABRIC_AGENT_ID={data_agent_id}"
-            updated = True
-            break
+    # Rewrite just the FABRIC_AGENT_ID line in place (if present)
+    agent_line = f"FABRIC_AGENT_ID={data_agent_id}"
+    env_content, updated = re.subn(r"^FABRIC_AGENT_ID=.*$", lambda m: agent_line,
+                                   env_content, count=1, flags=re.MULTILINE)
     
     if updated:
         with open(env_path, "w") as f:
-            f.write("\n".join(lines))
+            f.write(env_content)
         print(f"[OK] Updated .env with FABRIC_AGENT_ID={data_agent_id}")
 
 # ============================================================================
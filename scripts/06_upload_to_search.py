@@ -3,7 +3,7 @@
 Uploads PDF files from the data folder to Azure AI Search with page-aware chunking.
 
 Usage:
-    python 06_upload_to_search.py
+    python 06_upload_to_search.py [--no-cache]
 
 Prerequisites:
     - Run 01_generate_sample_data.py (creates PDF files in data folder)
@@ -18,10 +18,14 @@ The script will:
 5. Upload documents to the search index
 """
 
+import argparse
+import hashlib
 import os
 import sys
 import json
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # Load environment from azd + project .env
@@ -29,6 +33,7 @@ from load_env import load_all_env, get_required_env, print_env_status
 load_all_env()
 
 from azure.identity import DefaultAzureCredential
+from token_cache import get_access_token
 from openai import AzureOpenAI
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
@@ -47,11 +52,24 @@ from azure.search.documents.indexes.models import (
     SemanticSearch,
 )
 from pypdf import PdfReader
+import numpy as np
+
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
+p = argparse.ArgumentParser(description="Upload PDF files to Azure AI Search")
+p.add_argument("--no-cache", action="store_true",
+               help="Re-embed every chunk instead of reusing cached embeddings")
+args = p.parse_args()
+
 # Azure services - from azd environment
 AZURE_AI_ENDPOINT = os.getenv("AZURE_AI_ENDPOINT") or os.getenv("AZURE_AI_PROJECT_ENDPOINT", "").split("/api/projects")[0]
 AZURE_AI_SEARCH_ENDPOINT = os.getenv("AZURE_AI_SEARCH_ENDPOINT")
@@ -64,6 +82,15 @@ SOLUTION_NAME = os.getenv("SOLUTION_NAME") or os.getenv("SOLUTION_PREFIX") or os
 INDEX_NAME = f"{SOLUTION_NAME}-documents"
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+# Inputs per embeddings request; some Azure deployments cap this at 16
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# Rough per-request token budget (estimated as 4 characters per token)
+EMBEDDING_BATCH_TOKENS = 100_000
+EMBEDDING_WORKERS = 8
+# Documents per upload request; embeddings make each document tens of KB,
+# so this keeps requests well under the 16 MB limit
+UPLOAD_BATCH_SIZE = 250
+UPLOAD_WORKERS = 4
 
 if not AZURE_AI_SEARCH_ENDPOINT:
     print("ERROR: AZURE_AI_SEARCH_ENDPOINT not set in .env")
@@ -89,6 +116,9 @@ if not config_dir.exists():
 if not docs_dir.exists():
     docs_dir = data_dir  # Fallback to root data folder
 
+# Embeddings from earlier runs, one float32 .npy per (model, chunk text)
+embedding_cache_dir = config_dir / "embedding_cache"
+
 print(f"\n{'='*60}")
 print("Upload PDF Files to Azure AI Search")
 print(f"{'='*60}")
@@ -108,12 +138,19 @@ def get_openai_client():
         raise ValueError("AZURE_AI_PROJECT_ENDPOINT not set")
     
     credential = DefaultAzureCredential()
-    token = credential.get_token("https://cognitiveservices.azure.com/.default")
+    
+    def token_provider():
+        # Called per request: the shared cache hands back its token until it
+        # is close to expiry, then refreshes, so long runs never send a stale one
+        return get_access_token(credential, "https://cognitiveservices.azure.com/.default")
     
     return AzureOpenAI(
         azure_endpoint=AZURE_AI_ENDPOINT,
-        api_key=token.token,
+        azure_ad_token_provider=token_provider,
         api_version="2024-10-21",
+        # The SDK retries rate limits and timeouts with exponential backoff
+        # (honoring Retry-After); concurrent embedding batches make 429s likelier
+        max_retries=3,
     )
 
 # ============================================================================
@@ -216,15 +253,38 @@ def extract_pages_from_pdf(filepath: Path) -> list[tuple[int, str]]:
             pages.append((i + 1, text.strip()))
     return pages
 
+def extract_and_chunk_pdf(filepath: Path) -> list[tuple[int, list[str]]]:
+    """Extract a PDF and chunk each page.
+    
+    Returns list of (page_number, chunks) tuples. Both steps are CPU-bound,
+    so this is the unit of work handed to each worker process.
+    """
+    return [(page_num, chunk_text_by_sentences(text))
+            for page_num, text in extract_pages_from_pdf(filepath)]
+
+# Below this much PDF data, process start-up costs more than extraction itself
+PARALLEL_EXTRACT_MIN_BYTES = 1 << 20
+
+def chunk_all_pdfs(pdf_files: list[Path]):
+    """Yield each PDF's chunked pages in order, one file per worker process for large sets."""
+    total_bytes = sum(p.stat().st_size for p in pdf_files)
+    if len(pdf_files) < 2 or total_bytes < PARALLEL_EXTRACT_MIN_BYTES:
+        for p in pdf_files:
+            yield extract_and_chunk_pdf(p)
+        return
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(pdf_files))) as pool:
+        yield from pool.map(extract_and_chunk_pdf, pdf_files)
+
 # ============================================================================
 # Text Chunking
 # ============================================================================
 
+# Sentence-ending punctuation followed by space or newline
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
 def split_into_sentences(text: str) -> list[str]:
     """Split text into sentences, preserving sentence boundaries."""
-    # Split on sentence-ending punctuation followed by space or newline
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    return [s.strip() for s in sentences if s.strip()]
+    return [s for s in (x.strip() for x in SENTENCE_SPLIT_RE.split(text)) if s]
 
 def chunk_text_by_sentences(text: str, max_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
     """Split text into chunks that respect sentence boundaries.
@@ -237,69 +297,167 @@ def chunk_text_by_sentences(text: str, max_size: int = CHUNK_SIZE, overlap: int
     if not sentences:
         return [text] if text.strip() else []
     
-    chunks = []
-    current_chunk = []
+    # Chunks are recorded as (start, end) sentence ranges and joined once at the end
+    lengths = [len(s) for s in sentences]
+    bounds = []
+    start = 0  # first sentence of the current chunk
     current_length = 0
-    overlap_sentences = []
     
-    for sentence in sentences:
-        sentence_len = len(sentence)
-        
+    for i, sentence_len in enumerate(lengths):
         # If single sentence exceeds max_size, include it anyway (don't break mid-sentence)
         if sentence_len > max_size:
             # Save current chunk if it has content
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-                overlap_sentences = current_chunk[-2:] if len(current_chunk) >= 2 else current_chunk[:]
+            if i > start:
+                bounds.append((start, i))
             
-            chunks.append(sentence)
-            current_chunk = []
+            bounds.append((i, i + 1))
+            start = i + 1
             current_length = 0
-            overlap_sentences = []
             continue
         
         # Check if adding this sentence would exceed max_size
-        potential_length = current_length + sentence_len + (1 if current_chunk else 0)
+        potential_length = current_length + sentence_len + (1 if i > start else 0)
         
-        if potential_length > max_size and current_chunk:
+        if potential_length > max_size and i > start:
             # Save current chunk
-            chunks.append(' '.join(current_chunk))
+            bounds.append((start, i))
             
-            # Start new chunk with overlap from previous
-            overlap_text_len = sum(len(s) for s in overlap_sentences) + len(overlap_sentences)
-            if overlap_text_len < overlap and overlap_sentences:
-                current_chunk = overlap_sentences[:]
+            # Start new chunk with overlap: the last (up to) two sentences of the previous one
+            overlap_start = max(start, i - 2)
+            overlap_text_len = sum(lengths[overlap_start:i]) + (i - overlap_start)
+            if overlap_text_len < overlap:
+                start = overlap_start
                 current_length = overlap_text_len
             else:
-                current_chunk = []
+                start = i
                 current_length = 0
         
         # Add sentence to current chunk
-        current_chunk.append(sentence)
-        current_length += sentence_len + (1 if len(current_chunk) > 1 else 0)
-        
-        # Track sentences for potential overlap
-        overlap_sentences = current_chunk[-2:] if len(current_chunk) >= 2 else current_chunk[:]
+        current_length += sentence_len + (1 if i > start else 0)
     
     # Don't forget the last chunk
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    if start < len(sentences):
+        bounds.append((start, len(sentences)))
     
-    return chunks
+    return [' '.join(sentences[s:e]) for s, e in bounds]
 
 # ============================================================================
 # Embedding Generation
 # ============================================================================
 
-def get_embedding(client: AzureOpenAI, text: str) -> list[float]:
-    """Generate embedding for text using OpenAI client."""
-    response = client.embeddings.create(input=[text], model=EMBEDDING_MODEL)
-    return response.data[0].embedding
+def get_embeddings(client: AzureOpenAI, texts: list[str]) -> list[list[float]]:
+    """Generate embeddings for a batch of texts in one request."""
+    response = client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+    # Results carry their input index; don't rely on response order
+    return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+def embedding_cache_path(text: str) -> Path:
+    """Cache file for a chunk's embedding (keyed by model and content)."""
+    key = hashlib.blake2b(f"{EMBEDDING_MODEL}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    return embedding_cache_dir / f"{key}.npy"
+
+def embed_batch(client: AzureOpenAI, texts: list[str]) -> list[list[float]]:
+    """Embed a batch, requesting only the texts not already cached on disk."""
+    if args.no_cache:
+        return get_embeddings(client, texts)
+    
+    paths = [embedding_cache_path(t) for t in texts]
+    embeddings = [None] * len(texts)
+    missing = []
+    for i, path in enumerate(paths):
+        try:
+            embeddings[i] = np.load(path).tolist()
+        except (OSError, ValueError, EOFError):
+            missing.append(i)
+    
+    if missing:
+        embedding_cache_dir.mkdir(exist_ok=True)
+        for i, embedding in zip(missing, get_embeddings(client, [texts[i] for i in missing])):
+            embeddings[i] = embedding
+            # The index stores Single (float32) vectors, so nothing is lost
+            np.save(paths[i], np.asarray(embedding, dtype=np.float32))
+    return embeddings
+
+def to_single_precision(embedding: list[float]) -> list[float]:
+    """Round to the shortest decimals that still parse to the same float32.
+    
+    The index stores Single vectors, so the stored values are unchanged while
+    each vector's JSON in the upload request shrinks by roughly 40%.
+    """
+    return [float(x) for x in np.asarray(embedding, dtype=np.float32).astype(str)]
+
+def iter_embedding_batches(documents):
+    """Group documents into batches within the input-count and token limits."""
+    batch, batch_tokens = [], 0
+    for doc in documents:
+        tokens = len(doc["content"]) // 4 + 1
+        if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or batch_tokens + tokens > EMBEDDING_BATCH_TOKENS):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(doc)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+def embed_documents(client: AzureOpenAI, documents):
+    """Yield documents with embeddings attached, in order.
+    
+    Up to two batches per worker are kept in flight, so the documents
+    iterator is consumed only as fast as embeddings come back.
+    """
+    def attach(batch, future):
+        for doc, embedding in zip(batch, future.result()):
+            doc["embedding"] = to_single_precision(embedding)
+        return batch
+    
+    with ThreadPoolExecutor(max_workers=EMBEDDING_WORKERS) as pool:
+        in_flight = deque()
+        for batch in iter_embedding_batches(documents):
+            in_flight.append((batch, pool.submit(embed_batch, client, [d["content"] for d in batch])))
+            if len(in_flight) >= 2 * EMBEDDING_WORKERS:
+                yield from attach(*in_flight.popleft())
+        while in_flight:
+            yield from attach(*in_flight.popleft())
+
+def save_json_atomic(path, data):
+    """Write indented JSON to a temp file, then swap it into place"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
 
 # ============================================================================
 # Main
 # ============================================================================
 
+def iter_documents(pdf_files: list[Path]):
+    """Yield a search document (without embedding) for each chunk of each PDF."""
+    for pdf_path, pages in zip(pdf_files, chunk_all_pdfs(pdf_files)):
+        print(f"  {pdf_path.name}: {len(pages)} pages")
+        
+        # Same for every chunk of this PDF
+        stem = pdf_path.stem
+        source = pdf_path.name
+        title = stem.replace("_", " ").title()
+        
+        for page_num, chunks in pages:
+            for chunk_idx, chunk in enumerate(chunks):
+                # ID format: filename_pagenumber_chunknumber
+                doc_id = f"{stem}_p{page_num}_c{chunk_idx}"
+                
+                yield {
+                    "id": doc_id,
+                    "content": chunk,
+                    "title": title,
+                    "source": source,
+                    "page_number": page_num,
+                    "chunk_id": chunk_idx
+                }
+
 def main():
     # Find PDF files in documents subfolder
     pdf_files = list(docs_dir.glob("*.pdf"))
@@ -325,58 +483,42 @@ def main():
     print("\nCreating search index...")
     create_index(index_client)
     
-    # Process each PDF
-    documents = []
-    for pdf_path in pdf_files:
-        print(f"\nProcessing: {pdf_path.name}")
-        
-        pages = extract_pages_from_pdf(pdf_path)
-        print(f"  Extracted {len(pages)} pages")
-        
-        for page_num, page_text in pages:
-            chunks = chunk_text_by_sentences(page_text)
-            
-            for chunk_idx, chunk in enumerate(chunks):
-                # ID format: filename_pagenumber_chunknumber
-                doc_id = f"{pdf_path.stem}_p{page_num}_c{chunk_idx}"
-                
-                print(f"  Generating embedding for {doc_id}...", end=" ", flush=True)
-                embedding = get_embedding(openai_client, chunk)
-                print("[OK]")
-                
-                doc = {
-                    "id": doc_id,
-                    "content": chunk,
-                    "title": pdf_path.stem.replace("_", " ").title(),
-                    "source": pdf_path.name,
-                    "page_number": page_num,
-                    "chunk_id": chunk_idx,
-                    "embedding": embedding
-                }
-                documents.append(doc)
-    
-    # Upload to search
-    print(f"\nUploading {len(documents)} chunks to search index...")
-    result = search_client.upload_documents(documents)
-    succeeded = sum(1 for r in result if r.succeeded)
-    print(f"[OK] Uploaded {succeeded}/{len(documents)} documents")
+    # Pipeline: extract + chunk -> embed (batched, concurrent) -> upload (batched,
+    # concurrent). Each stage pulls from the previous one lazily, so the stages
+    # overlap and only the batches in flight are held in memory.
+    print("\nProcessing, embedding and uploading chunks to search index...")
+    document_count = 0
+    uploads = []
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as upload_pool:
+        batch = []
+        for doc in embed_documents(openai_client, iter_documents(pdf_files)):
+            document_count += 1
+            batch.append(doc)
+            if len(batch) == UPLOAD_BATCH_SIZE:
+                uploads.append(upload_pool.submit(search_client.upload_documents, batch))
+                batch = []
+                # One line per batch; flushed so 00_build_solution relays it live
+                print(f"  {document_count} chunks embedded, {len(uploads)} batch(es) queued for upload", flush=True)
+        if batch:
+            uploads.append(upload_pool.submit(search_client.upload_documents, batch))
+        succeeded = sum(1 for upload in uploads for r in upload.result() if r.succeeded)
+    print(f"[OK] Uploaded {succeeded}/{document_count} documents")
     
     # Save index info
     search_ids_path = config_dir / "search_ids.json"
     search_info = {
         "index_name": INDEX_NAME,
-        "document_count": len(documents),
+        "document_count": document_count,
         "pdf_files": [p.name for p in pdf_files]
     }
-    with open(search_ids_path, "w") as f:
-        json.dump(search_info, f, indent=2)
+    save_json_atomic(search_ids_path, search_info)
     print(f"[OK] Search info saved to: {search_ids_path}")
     
     print(f"\n{'='*60}")
     print("Upload Complete!")
     print(f"{'='*60}")
     print(f"Index: {INDEX_NAME}")
-    print(f"Documents: {len(documents)}")
+    print(f"Documents: {document_count}")
     print(f"\nYou can now query the index using Azure AI Search.")
 
 if __name__ == "__main__":
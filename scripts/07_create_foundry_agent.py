@@ -42,6 +42,13 @@ from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
 from azure.ai.projects.models import PromptAgentDefinition, FunctionTool
 
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -76,6 +83,22 @@ config_dir = os.path.join(data_dir, "config")
 if not os.path.exists(config_dir):
     config_dir = data_dir  # Fallback to old structure
 
+def load_json(path):
+    """Read a JSON file (orjson when installed)"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
+def save_json_atomic(path, data):
+    """Write indented JSON to a temp file, then swap it into place"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
 # ============================================================================
 # Load Ontology Config and Schema Prompt
 # ============================================================================
@@ -87,8 +110,7 @@ if not os.path.exists(config_path):
     print("       Run 01_generate_sample_data.py first")
     sys.exit(1)
 
-with open(config_path) as f:
-    ontology_config = json.load(f)
+ontology_config = load_json(config_path)
 
 scenario = ontology_config.get("scenario", "retail")
 scenario_name = ontology_config.get("name", "Business Data")
@@ -109,8 +131,7 @@ else:
 fabric_ids_path = os.path.join(config_dir, "fabric_ids.json")
 fabric_ids = {}
 if os.path.exists(fabric_ids_path):
-    with open(fabric_ids_path) as f:
-        fabric_ids = json.load(f)
+    fabric_ids = load_json(fabric_ids_path)
 elif not FOUNDRY_ONLY:
     print(f"ERROR: fabric_ids.json not found")
     print("       Run 02_create_fabric_items.py first, or use --foundry-only")
@@ -119,8 +140,7 @@ elif not FOUNDRY_ONLY:
 # Load Search IDs
 search_ids_path = os.path.join(config_dir, "search_ids.json")
 if os.path.exists(search_ids_path):
-    with open(search_ids_path) as f:
-        search_ids = json.load(f)
+    search_ids = load_json(search_ids_path)
     INDEX_NAME = search_ids.get("index_name", f"{fabric_ids.get('solution_name', 'demo')}-documents")
 else:
     INDEX_NAME = f"{fabric_ids.get('solution_name', 'demo')}-documents"
@@ -343,16 +363,14 @@ except Exception as e:
 agent_ids_path = os.path.join(config_dir, "agent_ids.json")
 agent_ids = {}
 if os.path.exists(agent_ids_path):
-    with open(agent_ids_path) as f:
-        agent_ids = json.load(f)
+    agent_ids = load_json(agent_ids_path)
 
 # Only save agent-specific info, not environment details
 agent_ids["agent_id"] = agent.id
 agent_ids["agent_name"] = agent.name
 agent_ids["search_index"] = INDEX_NAME
 
-with open(agent_ids_path, "w") as f:
-    json.dump(agent_ids, f, indent=2)
+save_json_atomic(agent_ids_path, agent_ids)
 
 print(f"\n[OK] Agent config saved to: {agent_ids_path}")
 
@@ -34,10 +34,16 @@ load_all_env()
 
 from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.search.documents import SearchClient
+from token_cache import get_access_token
 
-if not FOUNDRY_ONLY:
-    import pyodbc
+# Faster JSON parsing/encoding when orjson is installed (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+# pyodbc and the Search SDK are imported on first tool use (see execute_sql
+# and get_search_client), keeping them off the startup path
 
 # ============================================================================
 # Configuration
@@ -77,6 +83,11 @@ config_dir = os.path.join(data_dir, "config")
 if not os.path.exists(config_dir):
     config_dir = data_dir  # Fallback to old structure
 
+def load_json(path):
+    """Read a JSON file (orjson when installed)"""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read()) if ORJSON_AVAILABLE else json.load(f)
+
 # Get agent ID
 AGENT_ID = args.agent_id
 
@@ -84,8 +95,7 @@ if not AGENT_ID:
     # Try to load from agent_ids.json
     agent_ids_path = os.path.join(config_dir, "agent_ids.json")
     if os.path.exists(agent_ids_path):
-        with open(agent_ids_path) as f:
-            agent_ids = json.load(f)
+        agent_ids = load_json(agent_ids_path)
         AGENT_ID = agent_ids.get("agent_id")
 
 if not AGENT_ID:
@@ -96,10 +106,10 @@ if not AGENT_ID:
 # Load Fabric IDs (optional in foundry-only mode)
 LAKEHOUSE_NAME = None
 LAKEHOUSE_ID = None
+fabric_ids = {}
 fabric_ids_path = os.path.join(config_dir, "fabric_ids.json")
 if os.path.exists(fabric_ids_path):
-    with open(fabric_ids_path) as f:
-        fabric_ids = json.load(f)
+    fabric_ids = load_json(fabric_ids_path)
     LAKEHOUSE_NAME = fabric_ids.get("lakehouse_name")
     LAKEHOUSE_ID = fabric_ids.get("lakehouse_id")
 elif not FOUNDRY_ONLY:
@@ -109,16 +119,14 @@ elif not FOUNDRY_ONLY:
 # Load Search IDs
 search_ids_path = os.path.join(config_dir, "search_ids.json")
 if os.path.exists(search_ids_path):
-    with open(search_ids_path) as f:
-        search_ids = json.load(f)
+    search_ids = load_json(search_ids_path)
     INDEX_NAME = search_ids.get("index_name")
 else:
-    # Try to get solution name from fabric_ids or ontology
-    solution_name = "demo"
-    if os.path.exists(fabric_ids_path):
-        with open(fabric_ids_path) as f:
-            solution_name = json.load(f).get("solution_name", "demo")
-    INDEX_NAME = f"{solution_name}-documents"
+    # Fall back to the solution name from fabric_ids (already loaded above)
+    INDEX_NAME = f"{fabric_ids.get('solution_name', 'demo')}-documents"
+
+# One credential for the whole session (SQL endpoint lookup, SQL, Search, agent)
+credential = DefaultAzureCredential()
 
 print(f"\n{'='*60}")
 if FOUNDRY_ONLY:
@@ -137,11 +145,10 @@ SQL_ENDPOINT = None
 if not FOUNDRY_ONLY:
     def get_sql_endpoint():
         """Get the SQL analytics endpoint for the Lakehouse"""
-        credential = DefaultAzureCredential()
-        token = credential.get_token("https://api.fabric.microsoft.com/.default")
+        token = get_access_token(credential, "https://api.fabric.microsoft.com/.default")
         
         import requests
-        headers = {"Authorization": f"Bearer {token.token}"}
+        headers = {"Authorization": f"Bearer {token}"}
         url = f"https://api.fabric.microsoft.com/v1/workspaces/{WORKSPACE_ID}/lakehouses/{LAKEHOUSE_ID}"
         
         resp = requests.get(url, headers=headers)
@@ -160,48 +167,90 @@ if not FOUNDRY_ONLY:
 # SQL Execution Function
 # ============================================================================
 
+# Rows shown to the agent per query; only one more is fetched to detect truncation
+SQL_MAX_ROWS = 50
+
+SQL_COPT_SS_ACCESS_TOKEN = 1256
+
+# One connection for the whole chat session; reopened when the token rotates
+_sql_conn = None
+_sql_conn_token = None
+
+def get_sql_connection():
+    """Return the open SQL connection, reconnecting only when the AAD token changed"""
+    global _sql_conn, _sql_conn_token
+    import pyodbc
+    
+    # Cached AAD token for SQL (token_cache refreshes it shortly before expiry)
+    token = get_access_token(credential, 'https://database.windows.net//.default')
+    if _sql_conn is not None and token == _sql_conn_token:
+        return _sql_conn
+    close_sql_connection()
+    
+    # Build token struct with UTF-16-LE encoding (required for ODBC)
+    token_bytes = token.encode('UTF-16-LE')
+    token_struct = struct.pack(f'<I{len(token_bytes)}s', len(token_bytes), token_bytes)
+    
+    # Connection string
+    conn_str = f'Driver={{ODBC Driver 18 for SQL Server}};Server={SQL_ENDPOINT};Database={LAKEHOUSE_NAME};Encrypt=yes;TrustServerCertificate=no'
+    
+    # Connect with token (autocommit so no transaction stays open between queries)
+    _sql_conn = pyodbc.connect(conn_str, attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct},
+                               autocommit=True)
+    _sql_conn_token = token
+    return _sql_conn
+
+def close_sql_connection():
+    """Close the shared SQL connection, if any"""
+    global _sql_conn, _sql_conn_token
+    if _sql_conn is not None:
+        try:
+            _sql_conn.close()
+        except Exception:
+            pass
+    _sql_conn = None
+    _sql_conn_token = None
+
 def execute_sql(sql_query):
     """Execute SQL query against Fabric Lakehouse and return results"""
     if not SQL_ENDPOINT:
         return "Error: SQL endpoint not available"
     
     try:
-        # Get AAD token for SQL
-        credential = DefaultAzureCredential()
-        token = credential.get_token('https://database.windows.net//.default')
+        import pyodbc
         
-        # Build token struct with UTF-16-LE encoding (required for ODBC)
-        token_bytes = token.token.encode('UTF-16-LE')
-        token_struct = struct.pack(f'<I{len(token_bytes)}s', len(token_bytes), token_bytes)
-        
-        # Connection string
-        conn_str = f'Driver={{ODBC Driver 18 for SQL Server}};Server={SQL_ENDPOINT};Database={LAKEHOUSE_NAME};Encrypt=yes;TrustServerCertificate=no'
-        
-        # Connect with token
-        SQL_COPT_SS_ACCESS_TOKEN = 1256
-        conn = pyodbc.connect(conn_str, attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct})
+        conn = get_sql_connection()
         cursor = conn.cursor()
         
-        cursor.execute(sql_query)
+        try:
+            cursor.execute(sql_query)
+        except (pyodbc.OperationalError, pyodbc.InterfaceError):
+            # Dropped link (idle timeout, network blip): reconnect once and retry
+            close_sql_connection()
+            cursor = get_sql_connection().cursor()
+            cursor.execute(sql_query)
         
         columns = [col[0] for col in cursor.description]
-        rows = cursor.fetchall()
+        rows = cursor.fetchmany(SQL_MAX_ROWS + 1)
+        truncated = len(rows) > SQL_MAX_ROWS
+        rows = rows[:SQL_MAX_ROWS]
         
         # Format results
         result_lines = []
         result_lines.append("| " + " | ".join(columns) + " |")
         result_lines.append("|" + "|".join(["---"] * len(columns)) + "|")
         
-        for row in rows[:50]:  # Limit to 50 rows
+        for row in rows:
             values = [str(v) if v is not None else "NULL" for v in row]
             result_lines.append("| " + " | ".join(values) + " |")
         
-        if len(rows) > 50:
-            result_lines.append(f"\n... and {len(rows) - 50} more rows")
-        
-        result_lines.append(f"\n({len(rows)} rows returned)")
+        if truncated:
+            result_lines.append(f"\n... more rows not shown (use COUNT(*) for the total)")
+            result_lines.append(f"\n({SQL_MAX_ROWS}+ rows returned)")
+        else:
+            result_lines.append(f"\n({len(rows)} rows returned)")
         
-        conn.close()
+        cursor.close()
         return "\n".join(result_lines)
         
     except Exception as e:
@@ -211,15 +260,24 @@ def execute_sql(sql_query):
 # AI Search Function
 # ============================================================================
 
-def search_documents(query, top=3):
-    """Search documents in Azure AI Search"""
-    try:
-        credential = DefaultAzureCredential()
-        search_client = SearchClient(
+_search_client = None
+
+def get_search_client():
+    """Create the Search client on first use and reuse it (and its connections)"""
+    global _search_client
+    if _search_client is None:
+        from azure.search.documents import SearchClient
+        _search_client = SearchClient(
             endpoint=SEARCH_ENDPOINT,
             index_name=INDEX_NAME,
             credential=credential
         )
+    return _search_client
+
+def search_documents(query, top=3):
+    """Search documents in Azure AI Search"""
+    try:
+        search_client = get_search_client()
         
         # Perform hybrid search (text + vector if available)
         results = search_client.search(
@@ -254,20 +312,20 @@ questions_path = os.path.join(config_dir, "sample_questions.txt")
 sample_questions = []
 
 if os.path.exists(questions_path):
+    # Read line by line, stopping at the end of the COMBINED INSIGHT QUESTIONS
+    # section (best demonstrates multi-tool)
     with open(questions_path, "r") as f:
-        content = f.read()
-    
-    # Parse the COMBINED INSIGHT QUESTIONS section (best demonstrates multi-tool)
-    in_combined_section = False
-    for line in content.split("\n"):
-        if "COMBINED INSIGHT QUESTIONS" in line:
-            in_combined_section = True
-            continue
-        if in_combined_section:
-            if line.startswith("==="):  # Next section
-                break
-            if line.strip().startswith("- "):
-                sample_questions.append(line.strip()[2:])
+        in_combined_section = False
+        for line in f:
+            if "COMBINED INSIGHT QUESTIONS" in line:
+                in_combined_section = True
+                continue
+            if in_combined_section:
+                if line.startswith("==="):  # Next section
+                    break
+                line = line.strip()
+                if line.startswith("- "):
+                    sample_questions.append(line[2:])
 
 # Fallback if no questions loaded
 if not sample_questions:
@@ -280,7 +338,6 @@ if not sample_questions:
 # Initialize Client
 # ============================================================================
 
-credential = DefaultAzureCredential()
 project_client = AIProjectClient(
     endpoint=ENDPOINT,
     credential=credential
@@ -433,4 +490,5 @@ while True:
         print(f"Error: {e}")
 
 # Cleanup
+close_sql_connection()
 print("\nGoodbye!")
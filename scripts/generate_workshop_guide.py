@@ -12,7 +12,7 @@ Output:
 import os
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
-from datetime import datetime
+from datetime import datetime, timezone
 
 # ============================================================================
 # PDF Configuration
@@ -21,6 +21,8 @@ from datetime import datetime
 class WorkshopGuidePDF(FPDF):
     """Custom PDF class with header/footer"""
     
+    BULLET = chr(149)  # latin-1 bullet character
+    
     def __init__(self):
         super().__init__()
         self.set_auto_page_break(auto=True, margin=20)
@@ -63,19 +65,22 @@ class WorkshopGuidePDF(FPDF):
             self.cell(0, 8, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             self.ln(1)
     
-    def body_text(self, text, markdown=False):
-        """Add body text. Use markdown=True to support **bold** formatting."""
+    def body_style(self):
+        """Switch to the regular body font and color"""
         self.set_font("Helvetica", "", 11)
         self.set_text_color(51, 51, 51)
+    
+    def body_text(self, text, markdown=False):
+        """Add body text. Use markdown=True to support **bold** formatting."""
+        self.body_style()
         self.multi_cell(0, 6, text, markdown=markdown)
         self.ln(2)
     
     def bullet_point(self, text, indent=10, markdown=False):
         """Add a bullet point. Use markdown=True to support **bold** formatting."""
-        self.set_font("Helvetica", "", 11)
-        self.set_text_color(51, 51, 51)
+        self.body_style()
         self.set_x(indent + 10)
-        self.cell(5, 6, chr(149))  # bullet character
+        self.cell(5, 6, self.BULLET)
         self.multi_cell(0, 6, text, markdown=markdown)
     
     def numbered_item(self, number, text, indent=10, markdown=False):
@@ -84,8 +89,7 @@ class WorkshopGuidePDF(FPDF):
         self.set_text_color(0, 102, 153)
         self.set_x(indent + 10)
         self.cell(8, 6, f"{number}.")
-        self.set_font("Helvetica", "", 11)
-        self.set_text_color(51, 51, 51)
+        self.body_style()
         self.multi_cell(0, 6, text, markdown=markdown)
     
     def code_block(self, code, width=180):
@@ -93,7 +97,6 @@ class WorkshopGuidePDF(FPDF):
         self.set_font("Courier", "", 10)
         self.set_fill_color(245, 245, 245)
         self.set_text_color(51, 51, 51)
-        self.set_x(15)
         
         # Calculate height needed
         lines = code.split('\n')
@@ -134,10 +137,30 @@ class WorkshopGuidePDF(FPDF):
         self.set_y(y_start + height + 5)
 
 
+def build_command(industry, usecase, clean=True):
+    """00_build_solution.py invocation shown in the guide's code blocks"""
+    flags = " --clean" if clean else ""
+    return (
+        f'python scripts/00_build_solution.py{flags} \\\n'
+        f'    --industry "{industry}" \\\n'
+        f'    --usecase "{usecase}"'
+    )
+
+
+def build_date():
+    """Cover/creation date: SOURCE_DATE_EPOCH when set (reproducible builds), else now"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    return datetime.now().astimezone()
+
+
 def generate_workshop_guide():
     """Generate the workshop guide PDF"""
     
+    updated = build_date()
     pdf = WorkshopGuidePDF()
+    pdf.set_creation_date(updated)
     
     # ========================================================================
     # Cover Page
@@ -167,7 +190,7 @@ def generate_workshop_guide():
     
     pdf.ln(60)
     pdf.set_font("Helvetica", "I", 10)
-    pdf.cell(0, 6, f"Updated: {datetime.now().strftime('%B %d, %Y')}", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(0, 6, f"Updated: {updated.strftime('%B %d, %Y')}", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
     # ========================================================================
     # Table of Contents
@@ -327,11 +350,7 @@ def generate_workshop_guide():
     pdf.body_text(
         "The build script automates all steps. Run this single command:"
     )
-    pdf.code_block(
-        'python scripts/00_build_solution.py \\\n'
-        '    --industry "Telecommunications" \\\n'
-        '    --usecase "Network operations with outage tracking"'
-    )
+    pdf.code_block(build_command("Telecommunications", "Network operations with outage tracking", clean=False))
     
     pdf.info_box(
         "Note",
@@ -413,18 +432,10 @@ def generate_workshop_guide():
     
     pdf.chapter_title("Step 2: Run with AI Generation", level=2)
     pdf.body_text("Run the build script with your industry and use case:")
-    pdf.code_block(
-        'python scripts/00_build_solution.py --clean \\\n'
-        '    --industry "YOUR_INDUSTRY" \\\n'
-        '    --usecase "YOUR_USE_CASE"'
-    )
+    pdf.code_block(build_command("YOUR_INDUSTRY", "YOUR_USE_CASE"))
     
     pdf.body_text("For example, to create an Insurance claims system:")
-    pdf.code_block(
-        'python scripts/00_build_solution.py --clean \\\n'
-        '    --industry "Insurance" \\\n'
-        '    --usecase "Claims processing and policy management"'
-    )
+    pdf.code_block(build_command("Insurance", "Claims processing and policy management"))
     
     pdf.info_box(
         "Tip",
@@ -438,11 +449,7 @@ def generate_workshop_guide():
         "When you want to try a different scenario, use the --clean flag to "
         "create fresh Fabric artifacts:"
     )
-    pdf.code_block(
-        'python scripts/00_build_solution.py --clean \\\n'
-        '    --industry "Finance" \\\n'
-        '    --usecase "Loan applications and credit scoring"'
-    )
+    pdf.code_block(build_command("Finance", "Loan applications and credit scoring"))
     
     pdf.body_text(
         "The --clean flag increments the artifact suffix (lakehouse_1 -> lakehouse_2) "
@@ -29,7 +29,30 @@ Project settings (from .env):
 import os
 import json
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
+
+# Parsed .env files keyed by path -> (mtime, values)
+_ENV_FILE_CACHE = {}
+
+
+def _load_env_file(env_path):
+    """
+    Apply a .env file to os.environ without overriding existing values.
+    
+    The parsed contents are cached by modification time, so repeated calls
+    in one process (e.g. 00_build_solution.py --in-process) only re-parse
+    the file after it has been rewritten.
+    """
+    key = str(env_path)
+    mtime = os.path.getmtime(env_path)
+    cached = _ENV_FILE_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, dotenv_values(env_path))
+        _ENV_FILE_CACHE[key] = cached
+    
+    for name, value in cached[1].items():
+        if value is not None and name not in os.environ:
+            os.environ[name] = value
 
 
 def load_azd_env():
@@ -53,7 +76,7 @@ def load_azd_env():
     if env_name:
         env_path = azure_dir / env_name / ".env"
         if env_path.exists():
-            load_dotenv(env_path)
+            _load_env_file(env_path)
             return True
     
     return False
@@ -69,7 +92,7 @@ def load_project_env():
     project_env = script_dir.parent / ".env"
     
     if project_env.exists():
-        load_dotenv(project_env, override=False)  # Don't override azd values
+        _load_env_file(project_env)  # Don't override azd values
         return True
     
     return False
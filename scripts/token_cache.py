@@ -0,0 +1,155 @@
+"""
+Share Azure AD access tokens across pipeline scripts.
+
+Every step runs in its own Python process, and each one used to ask its
+credential for a brand-new token (AzureCliCredential spawns the `az` CLI
+for every request). Tokens are valid for about an hour, so the first step
+that acquires one persists it and later steps reuse it until it is close
+to expiry.
+
+Use get_access_token() for raw REST calls and CachedTokenCredential to
+hand the same cache to Azure SDK clients.
+
+Cache location: ~/.cache/nciq/tokens.json (override with NCIQ_TOKEN_CACHE).
+The file is created with owner-only permissions and replaced atomically.
+Entries are keyed by the credential type and the signed-in az CLI account
+(from azureProfile.json), so after `az login` as someone else the old
+identity's tokens are not reused, and a DefaultAzureCredential that signs in
+as a managed identity never shares tokens with AzureCliCredential. When the
+account can't be determined, tokens are cached in memory only.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = Path(os.environ.get("NCIQ_TOKEN_CACHE",
+                                 Path.home() / ".cache" / "nciq" / "tokens.json"))
+
+# Refresh tokens this many seconds before they expire
+REFRESH_MARGIN = 300
+
+# In-process copy of the entries by cache key, so repeated calls don't
+# re-read the file.
+# The lock keeps parallel threads from each spawning `az` for the same scope.
+_memory = {}
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _cli_account():
+    """Return the az CLI's default account as "tenant/user", or None if unknown.
+
+    Read once per process; the account is fixed for a run.
+    """
+    config_dir = Path(os.environ.get("AZURE_CONFIG_DIR") or Path.home() / ".azure")
+    try:
+        # az writes this file with a UTF-8 BOM
+        with open(config_dir / "azureProfile.json", encoding="utf-8-sig") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for subscription in profile.get("subscriptions", []):
+        if subscription.get("isDefault"):
+            user = subscription.get("user", {}).get("name", "")
+            return f"{subscription.get('tenantId', '')}/{user}"
+    return None
+
+
+def _cache_key(credential, scope):
+    """Key tokens by credential type, signed-in account, pinned tenant/client and scope.
+
+    The account part is empty when it is unknown; such keys are kept in
+    memory only.
+    """
+    return (f"{type(credential).__name__}|{_cli_account() or ''}"
+            f"|{os.environ.get('AZURE_TENANT_ID', '')}"
+            f"|{os.environ.get('AZURE_CLIENT_ID', '')}|{scope}")
+
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache):
+    """Write to a temp file and swap it in, so concurrent steps never read a partial file."""
+    tmp_path = CACHE_PATH.with_name(f"{CACHE_PATH.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        # Caching is best-effort; the token is still returned
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _is_fresh(entry):
+    return entry is not None and entry.get("expires_on", 0) - REFRESH_MARGIN > time.time()
+
+
+def _get_entry(credential, scope):
+    """Return the cached {"token", "expires_on"} entry for scope, refreshing if needed."""
+    key = _cache_key(credential, scope)
+    entry = _memory.get(key)
+    if _is_fresh(entry):
+        return entry
+
+    with _lock:
+        persist = _cli_account() is not None
+        cache = _read_cache() if persist else {}
+        entry = cache.get(key)
+        if not _is_fresh(entry):
+            token = credential.get_token(scope)
+            entry = {"token": token.token, "expires_on": token.expires_on}
+            if persist:
+                # Drop expired entries (e.g. other accounts) while rewriting
+                now = time.time()
+                cache = {k: v for k, v in cache.items() if v.get("expires_on", 0) > now}
+                cache[key] = entry
+                _write_cache(cache)
+        _memory[key] = entry
+    return entry
+
+
+def get_access_token(credential, scope):
+    """
+    Get an access token string for scope, reusing a cached one when valid.
+
+    Args:
+        credential: Any azure-identity credential (used only on a cache miss)
+        scope: Token scope, e.g. "https://api.fabric.microsoft.com/.default"
+
+    Returns:
+        The bearer token string
+    """
+    return _get_entry(credential, scope)["token"]
+
+
+class CachedTokenCredential:
+    """
+    Credential for Azure SDK clients (e.g. DataLakeServiceClient) that serves
+    tokens from this cache, so SDK calls skip re-authenticating too.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    def get_token(self, *scopes, **kwargs):
+        from azure.core.credentials import AccessToken
+        if kwargs.get("claims") or kwargs.get("tenant_id"):
+            # CAE claims challenges and other tenants need a fresh token
+            return self._credential.get_token(*scopes, **kwargs)
+        entry = _get_entry(self._credential, " ".join(scopes))
+        return AccessToken(entry["token"], int(entry["expires_on"]))